@@ -0,0 +1,492 @@
+# analyzer.py
+
+import asyncio
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import NamedTuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import pylint
+
+from file_context import FileContext
+from limits import FileLimitExceeded, enforce_limits
+from metrics import measure
+from project_index import ProjectIndex, summarize_module
+from pylint_utils import PYLINT_OPTIONS, PylintEngine, run_pylint_batch, run_pylint_batch_async
+from result_cache import ResultCache, config_key
+from smell import SmellKind, SmellList
+from version import __version__
+from checker_registry import AST, checker_visitors, needs_pylint, select_checkers
+from code_smell_checkers import THRESHOLDS, check_project_dead_code, check_project_hierarchy
+
+class FileResult(NamedTuple):
+    """Resultado da análise de um arquivo."""
+    path: str
+    smells: SmellList
+    summary: Optional[dict] = None  # resumo de símbolos, se solicitado
+    skipped: Optional[str] = None  # motivo, se o arquivo excedeu os limites e não foi analisado
+    metrics: Optional[dict] = None  # duração de cada etapa e de cada checker, se solicitada
+
+
+# Engine do pylint e cache de resultados do processo atual, criados na primeira utilização
+_engine = None
+_cache = None
+
+
+def _get_engine():
+    global _engine
+    if _engine is None:
+        _engine = PylintEngine()
+    return _engine
+
+
+def forget_files(file_paths):
+    """Descarta o estado do pylint mantido para arquivos alterados desde a última análise."""
+    if _engine is not None:
+        _engine.forget(file_paths)
+
+
+def _discard_engine(file_path):
+    """Descarta o engine do pylint interrompido no meio de um arquivo; o próximo uso cria outro."""
+    global _engine
+    if _engine is not None:
+        _engine.forget([file_path])
+        _engine = None
+
+
+def _get_cache(cache_file, config):
+    global _cache
+    if _cache is None or (_cache.path, _cache.config) != (cache_file, config):
+        _cache = ResultCache(cache_file, config)
+    return _cache
+
+
+def analysis_config_key(checkers, options=None, pylint_in_process=True):
+    """
+    Chave do cache para a versão do Scylla, do pylint, os limites, os checkers
+    selecionados e o modo de execução do pylint (em processo ou externo), quando
+    algum checker depende dele.
+    """
+    pylint_mode = None
+    if needs_pylint(checkers):
+        pylint_mode = "in-process" if pylint_in_process else "subprocess"
+    return config_key(
+        scylla=__version__,
+        pylint=pylint.__version__,
+        pylint_mode=pylint_mode,
+        thresholds=THRESHOLDS,
+        pylint_options=PYLINT_OPTIONS,
+        smells=[checker.smell for checker in checkers],
+        options=options or {},
+    )
+
+
+def analyze_file(ctx, pylint_messages, checkers, options=None, timings=None):
+    """
+    Executa os checkers selecionados em um único arquivo.
+
+    Args:
+        ctx (FileContext): Contexto do arquivo Python.
+        pylint_messages (List[PylintMessage]): Mensagens do pylint para o arquivo,
+            ou None se nenhum checker depender do pylint.
+        checkers (List[Checker]): Checkers a executar.
+        options (Dict[str, dict]): Argumentos extras por code smell.
+        timings (dict): Se informado, recebe, por code smell, a duração do
+            checker e a quantidade de code smells encontrados.
+
+    Returns:
+        SmellList: Code smells encontrados no arquivo.
+    """
+    smells = SmellList(ctx.path)
+    for checker in checkers:
+        if timings is None:
+            smells.extend(checker.run(ctx, pylint_messages, options))
+            continue
+        started = time.perf_counter()
+        found = list(checker.run(ctx, pylint_messages, options))
+        timings[checker.smell] = (time.perf_counter() - started, len(found))
+        smells.extend(found)
+    return smells
+
+
+def _read_contexts(file_paths, metrics=None):
+    """Lê os arquivos, registrando em `metrics` (se informado) a leitura de cada um e os bytes lidos."""
+    contexts = []
+    for file_path in file_paths:
+        file_metrics = {} if metrics is not None else None
+        with measure(file_metrics, "read"):
+            ctx = FileContext.from_path(file_path)
+        if metrics is not None:
+            file_metrics["bytes"] = ctx.size
+            metrics[ctx.path] = file_metrics
+        contexts.append(ctx)
+    return contexts
+
+
+def analyze_chunk(file_paths, pylint_in_process=True, cache_file=None, only=None, skip=None, options=None,
+                  summaries=False, limits=None, metrics=False, profile_memory=False):
+    """
+    Analisa um grupo de arquivos, na ordem recebida.
+
+    Args:
+        file_paths (List[str]): Caminhos dos arquivos Python.
+        pylint_in_process (bool): Usa o engine do pylint do processo atual. Se False,
+            executa um único subprocesso do pylint para os arquivos do grupo
+            que não estão no cache.
+        cache_file (str): Banco do cache de resultados. None desativa o cache.
+        only (List[str]): Code smells a detectar. None detecta todos.
+        skip (List[str]): Code smells a não detectar.
+        options (Dict[str, dict]): Argumentos extras por code smell.
+        summaries (bool): Também gera o resumo de símbolos de cada arquivo, usado
+            pela análise de código morto do projeto inteiro.
+        limits (FileLimits): Limites de tempo e de memória do pylint e dos
+            checkers em cada arquivo. Arquivos que os excedem são ignorados
+            (ver `FileResult.skipped`) e os demais seguem normalmente.
+        metrics (bool): Registra em `FileResult.metrics` a duração de cada etapa
+            (leitura, parse, pylint, checkers) e de cada checker.
+        profile_memory (bool): Com `metrics`, ativa o tracemalloc neste processo
+            para registrar também a memória de cada etapa.
+
+    Returns:
+        List[FileResult]: Resultado de cada arquivo.
+    """
+    if profile_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    # Lê e decodifica cada arquivo uma única vez para todos os checkers
+    file_metrics = {} if metrics else None
+    contexts = _read_contexts(file_paths, file_metrics)
+    return analyze_contexts(contexts, pylint_in_process, cache_file, only, skip, options, summaries,
+                            limits=limits, metrics=file_metrics)
+
+
+def analyze_contexts(contexts, pylint_in_process=True, cache_file=None, only=None, skip=None, options=None,
+                     summaries=False, lint_paths=None, pylint_messages=None, limits=None, metrics=None):
+    """
+    Analisa arquivos já lidos, na ordem recebida.
+
+    Os argumentos são os mesmos de `analyze_chunk`, além de:
+
+    Args:
+        contexts (List[FileContext]): Contextos dos arquivos.
+        lint_paths (Dict[str, str]): Caminho, por arquivo, do conteúdo entregue ao
+            pylint, quando ele não está em `ctx.path` (ex.: um buffer ainda não
+            salvo, gravado em um arquivo temporário).
+        pylint_messages (Dict[str, List[PylintMessage]]): Mensagens do pylint já
+            obtidas, por arquivo. Quando informadas, o pylint não é executado.
+        metrics (Dict[str, dict]): Se informado, as métricas de cada arquivo (já
+            com as etapas medidas por quem chamou, como a leitura) são
+            completadas e devolvidas em `FileResult.metrics`.
+
+    Returns:
+        List[FileResult]: Resultado de cada arquivo.
+    """
+    checkers = select_checkers(only, skip)
+    lint_paths = lint_paths or {}
+
+    cache = _get_cache(cache_file, analysis_config_key(checkers, options, pylint_in_process)) if cache_file else None
+    cached = {}
+    if cache is not None:
+        for ctx in contexts:
+            smells = cache.get(ctx.path, ctx.content_hash)
+            if smells is not None:
+                cached[ctx.path] = smells
+
+    # O pylint só é executado se algum checker selecionado depender dele
+    lint = None
+    uses_engine = False
+    if needs_pylint(checkers):
+        if pylint_messages is not None:
+            lint = pylint_messages.__getitem__
+        elif pylint_in_process:
+            lint = _get_engine().run
+            uses_engine = True
+        else:
+            pending = [ctx for ctx in contexts if ctx.path not in cached]
+            started = time.perf_counter()
+            lint = run_pylint_batch([lint_paths.get(ctx.path, ctx.path) for ctx in pending],
+                                    limits=limits).__getitem__
+            if metrics is not None and pending:
+                # Um único processo analisa o lote: sua duração é dividida entre os arquivos
+                share = (time.perf_counter() - started) / len(pending)
+                for ctx in pending:
+                    metrics.setdefault(ctx.path, {})["pylint"] = share
+    parses = summaries or any(AST in checker.requires for checker in checkers)
+    # Só os visitors dos checkers selecionados passam pela AST
+    visitor_classes = checker_visitors(checkers)
+
+    results = []
+    for ctx in contexts:
+        file_metrics = metrics.setdefault(ctx.path, {}) if metrics is not None else None
+        try:
+            smells = cached.get(ctx.path)
+            if smells is None:
+                lint_path = lint_paths.get(ctx.path, ctx.path)
+                with enforce_limits(limits, "pylint"), measure(file_metrics if uses_engine else None, "pylint"):
+                    try:
+                        messages = lint(lint_path) if lint else None
+                    except FileLimitExceeded:
+                        if uses_engine:
+                            _discard_engine(lint_path)
+                            lint = _get_engine().run
+                        raise
+                if isinstance(messages, FileLimitExceeded):
+                    raise messages
+                with enforce_limits(limits, "checkers"):
+                    if file_metrics is not None and parses:
+                        with measure(file_metrics, "parse"):
+                            _ = ctx.tree  # força o parse para medir a etapa
+                    timings = file_metrics.setdefault("checkers", {}) if file_metrics is not None else None
+                    with measure(file_metrics, "check"):
+                        ctx.run_visitors(visitor_classes)
+                        smells = analyze_file(ctx, messages, checkers, options, timings)
+                if cache is not None:
+                    cache.put(ctx.content_hash, smells)
+            elif file_metrics is not None:
+                file_metrics["cached"] = True
+
+            summary = None
+            if summaries:
+                summary = cache.get_summary(ctx.content_hash) if cache is not None else None
+                if summary is None:
+                    with enforce_limits(limits, "checkers"), measure(file_metrics, "summary"):
+                        summary = summarize_module(ctx.tree)
+                    if cache is not None:
+                        cache.put_summary(ctx.content_hash, summary)
+        except FileLimitExceeded as error:
+            # Arquivos ignorados não vão para o cache: serão tentados de novo na próxima análise
+            results.append(FileResult(ctx.path, SmellList(ctx.path), None, error.reason, file_metrics))
+            continue
+
+        results.append(FileResult(ctx.path, smells, summary, None, file_metrics))
+
+    if cache is not None:
+        cache.commit()
+    return results
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def _timed_pylint_batch(file_paths, semaphore, limits=None):
+    """Executa `run_pylint_batch_async` e devolve também sua duração, sem contar a espera pelo semáforo."""
+    async with semaphore:
+        started = time.perf_counter()
+        messages = await run_pylint_batch_async(file_paths, None, limits)
+        return messages, time.perf_counter() - started
+
+
+def _analyze_linted_contexts(contexts, cache_file=None, only=None, skip=None, options=None, summaries=False,
+                             pylint_messages=None, limits=None, metrics=None, profile_memory=False):
+    """Executa os checkers em arquivos já lidos e já analisados pelo pylint externo (ver `analyze_contexts`)."""
+    if profile_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return analyze_contexts(contexts, False, cache_file, only, skip, options, summaries,
+                            pylint_messages=pylint_messages, limits=limits, metrics=metrics)
+
+
+async def _drain_tasks():
+    """Aguarda o fim (ou o cancelamento) das demais tarefas do event loop."""
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _analyze_files_scheduled(chunks, concurrency, jobs=1, cache_file=None, only=None, skip=None, options=None,
+                             summaries=False, limits=None, metrics=False, profile_memory=False):
+    """
+    Analisa os grupos de arquivos com o pylint em subprocessos, escalonados por asyncio.
+
+    O event loop roda em uma thread própria, onde até `concurrency` processos
+    do pylint executam ao mesmo tempo (limitados por um semáforo), cada um com
+    um grupo de arquivos: a saída deles é lida e novos processos começam
+    assim que há vaga, mesmo enquanto os checkers rodam. Os checkers dos
+    grupos cujo pylint já terminou rodam em `jobs` processos (ou na thread
+    atual, com `jobs` igual a 1). A leitura dos arquivos e a consulta ao
+    cache ficam na thread atual; os resultados saem na ordem dos grupos.
+
+    Yields:
+        FileResult: Resultado de cada arquivo.
+    """
+    checkers = select_checkers(only, skip)
+    cache = _get_cache(cache_file, analysis_config_key(checkers, options, False)) if cache_file else None
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="pylint-scheduler", daemon=True)
+    thread.start()
+
+    async def create_semaphore():
+        return asyncio.Semaphore(concurrency)
+
+    semaphore = asyncio.run_coroutine_threadsafe(create_semaphore(), loop).result()
+    linting = deque()
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    analyzing = deque()
+
+    def check(contexts, lint, file_metrics):
+        # Aguarda só o pylint deste grupo; os demais continuam na thread do event loop
+        messages, seconds = lint.result()
+        if file_metrics is not None and messages:
+            # Um único processo analisa o lote: sua duração é dividida entre os arquivos
+            for path in messages:
+                file_metrics[path]["pylint"] = seconds / len(messages)
+        args = (contexts, cache_file, only, skip, options, summaries, messages, limits, file_metrics,
+                profile_memory)
+        if executor is None:
+            return _analyze_linted_contexts(*args)
+        analyzing.append(executor.submit(_analyze_linted_contexts, *args))
+        return []
+
+    try:
+        for chunk in chunks:
+            file_metrics = {} if metrics else None
+            contexts = _read_contexts(chunk, file_metrics)
+            # Arquivos já no cache não passam pelo pylint
+            paths = [ctx.path for ctx in contexts
+                     if cache is None or cache.get(ctx.path, ctx.content_hash) is None]
+            lint = asyncio.run_coroutine_threadsafe(_timed_pylint_batch(paths, semaphore, limits), loop)
+            linting.append((contexts, lint, file_metrics))
+
+            # Mantém processos suficientes na fila sem esgotar a varredura
+            if len(linting) > concurrency * 2:
+                yield from check(*linting.popleft())
+            if len(analyzing) >= jobs * 2:
+                yield from analyzing.popleft().result()
+        while linting:
+            yield from check(*linting.popleft())
+        while analyzing:
+            yield from analyzing.popleft().result()
+    finally:
+        for _, lint, _ in linting:
+            lint.cancel()
+        asyncio.run_coroutine_threadsafe(_drain_tasks(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def analyze_files(file_paths, jobs=1, chunk_size=16, pylint_in_process=True, cache_file=None,
+                  only=None, skip=None, options=None, summaries=False, limits=None, metrics=False,
+                  profile_memory=False):
+    """
+    Analisa vários arquivos, opcionalmente em paralelo.
+
+    Os arquivos são consumidos sob demanda, divididos em grupos de
+    `chunk_size` e distribuídos entre `jobs` processos. Os resultados são
+    devolvidos na mesma ordem de `file_paths`, independentemente da ordem em
+    que os processos terminam.
+
+    Args:
+        file_paths (Iterable[str]): Caminhos dos arquivos Python.
+        jobs (int): Quantidade de processos. 0 usa todos os núcleos disponíveis.
+            Com `pylint_in_process=False`, é também a quantidade de processos do
+            pylint executados ao mesmo tempo.
+        chunk_size (int): Quantidade de arquivos enviada a cada processo por vez.
+        pylint_in_process (bool): Executa o pylint dentro dos processos de análise.
+        cache_file (str): Banco do cache de resultados, compartilhado pelos
+            processos. None desativa o cache.
+        only (List[str]): Code smells a detectar. None detecta todos.
+        skip (List[str]): Code smells a não detectar.
+        options (Dict[str, dict]): Argumentos extras por code smell.
+        summaries (bool): Também gera o resumo de símbolos de cada arquivo.
+        limits (FileLimits): Limites de tempo e de memória por arquivo.
+        metrics (bool): Registra em `FileResult.metrics` a duração de cada etapa
+            e de cada checker.
+        profile_memory (bool): Com `metrics`, ativa o tracemalloc nos processos
+            de análise para registrar também a memória de cada etapa.
+
+    Yields:
+        FileResult: Resultado de cada arquivo.
+    """
+    chunks = _chunked(file_paths, chunk_size)
+    jobs = jobs or os.cpu_count() or 1
+
+    # Com o pylint externo, o paralelismo está nos processos do pylint
+    if not pylint_in_process and needs_pylint(select_checkers(only, skip)):
+        yield from _analyze_files_scheduled(chunks, jobs, jobs, cache_file, only, skip, options, summaries, limits,
+                                            metrics, profile_memory)
+        return
+
+    if jobs == 1:
+        for chunk in chunks:
+            yield from analyze_chunk(chunk, pylint_in_process, cache_file, only, skip, options, summaries, limits,
+                                     metrics, profile_memory)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Mantém alguns grupos na fila de cada processo sem esgotar a varredura
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(analyze_chunk, chunk, pylint_in_process, cache_file, only, skip, options,
+                                           summaries, limits, metrics, profile_memory))
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def project_setup(directory, only=None, skip=None, options=None, project_dead_code=False,
+                  project_hierarchy=False):
+    """
+    Prepara os code smells verificados sobre o projeto inteiro, depois de todos os arquivos.
+
+    Args:
+        directory (str): Diretório (ou arquivo) analisado.
+        only (List[str]): Code smells a detectar. None detecta todos.
+        skip (List[str]): Code smells a não detectar.
+        options (Dict[str, dict]): Argumentos extras por code smell.
+        project_dead_code (bool): Verifica Dead Code no projeto inteiro.
+        project_hierarchy (bool): Verifica Lazy Class e Parallel Inheritance
+            Hierarchies na hierarquia de classes do projeto inteiro.
+
+    Returns:
+        Tuple[List[str], Dict[str, dict], Optional[ProjectIndex]]: Code smells do projeto,
+            opções dos checkers (com a verificação por arquivo desses code smells
+            desativada) e o índice do projeto, ou None se não houver nenhum.
+
+    Raises:
+        ValueError: Se algum nome em `only` ou `skip` não corresponder a um checker.
+    """
+    selected = {checker.smell for checker in select_checkers(only, skip)}
+
+    project_options = {}
+    if project_dead_code:
+        project_options[SmellKind.DEAD_CODE.value] = {"local_unused": False}
+    if project_hierarchy:
+        project_options[SmellKind.LAZY_CLASS.value] = {"local_hierarchy": False}
+        project_options[SmellKind.PARALLEL_INHERITANCE.value] = {"local_hierarchy": False}
+    project_smells = [smell for smell in project_options if smell in selected]
+    if not project_smells:
+        return project_smells, options, None
+
+    root = directory if os.path.isdir(directory) else os.path.dirname(directory)
+    options = dict(options or {})
+    for smell in project_smells:
+        options[smell] = {**options.get(smell, {}), **project_options[smell]}
+    return project_smells, options, ProjectIndex(root)
+
+
+def project_findings(project_index, project_smells):
+    """
+    Calcula os code smells do projeto inteiro.
+
+    Returns:
+        List[Smell]: Code smells encontrados, na ordem dos arquivos do índice.
+    """
+    findings = []
+    if SmellKind.DEAD_CODE.value in project_smells:
+        findings.extend(check_project_dead_code(project_index))
+    hierarchy_smells = [smell for smell in project_smells if smell != SmellKind.DEAD_CODE.value]
+    if hierarchy_smells:
+        findings.extend(check_project_hierarchy(project_index, hierarchy_smells))
+
+    order = {file_path: position for position, file_path in enumerate(project_index.files)}
+    findings.sort(key=lambda smell: order[smell.path])
+    return findings
@@ -0,0 +1,50 @@
+# ast_engine.py
+
+import ast
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+class StructuralVisitor(ABC):
+    """
+    Base dos visitors usados pelos checkers estruturais.
+
+    Cada visitor declara em `node_types` os tipos de nó que quer receber; o
+    engine percorre a AST uma única vez e chama `visit` apenas para esses
+    tipos. O estado acumulado fica nos atributos do próprio visitor, que os
+    checkers consultam depois da passagem.
+    """
+
+    node_types = ()
+
+    @abstractmethod
+    def visit(self, node):
+        """Recebe um nó de um dos tipos em `node_types`."""
+
+
+def run_visitors(tree, visitor_classes):
+    """
+    Percorre a AST uma única vez, despachando cada nó aos visitors interessados.
+
+    Os nós são visitados na ordem de `ast.walk`.
+
+    Args:
+        tree (ast.AST): AST do arquivo.
+        visitor_classes (List[type]): Classes dos visitors a executar.
+
+    Returns:
+        Dict[type, StructuralVisitor]: Visitor já executado, por classe.
+    """
+    visitors = {visitor_cls: visitor_cls() for visitor_cls in visitor_classes}
+
+    dispatch = defaultdict(list)
+    for visitor in visitors.values():
+        for node_type in visitor.node_types:
+            dispatch[node_type].append(visitor.visit)
+
+    for node in ast.walk(tree):
+        callbacks = dispatch.get(type(node))
+        if callbacks:
+            for callback in callbacks:
+                callback(node)
+
+    return visitors
@@ -0,0 +1,236 @@
+# benchmark.py
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import pylint
+
+from analyzer import analyze_files
+from checker_registry import PYLINT, needs_pylint, select_checkers, smell_names
+from file_context import FileContext
+from pylint_utils import PylintEngine
+from version import __version__
+from walker import iter_python_files
+
+DEFAULT_CORPORA_DIR = os.path.join("evaluation", "code fragments")
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def default_corpora():
+    """Corpora de avaliação distribuídos com o repositório."""
+    if not os.path.isdir(DEFAULT_CORPORA_DIR):
+        return []
+    return sorted(
+        entry.path for entry in os.scandir(DEFAULT_CORPORA_DIR) if entry.is_dir()
+    )
+
+
+def peak_rss_mb():
+    """Pico de memória residente deste processo e dos seus filhos, em MB (None se indisponível)."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss é dado em KB no Linux e em bytes no macOS
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+def _rates(seconds, files, loc):
+    return {
+        "seconds": round(seconds, 4),
+        "files_per_second": round(files / seconds, 2) if seconds else None,
+        "loc_per_second": round(loc / seconds, 1) if seconds else None,
+    }
+
+
+def measure_pipeline(corpus, only=None, jobs=1, pylint_in_process=True):
+    """
+    Executa a análise completa (sem cache) de um corpus e mede o desempenho.
+
+    Returns:
+        dict: Tempo, arquivos/s, linhas/s, pico de memória e code smells encontrados.
+    """
+    files = list(iter_python_files(corpus))
+    started = time.perf_counter()
+    smells = 0
+    loc = 0
+    for result in analyze_files(files, jobs=jobs, pylint_in_process=pylint_in_process, only=only):
+        smells += len(result.smells)
+    seconds = time.perf_counter() - started
+    for file_path in files:
+        with open(file_path, "rb") as file:
+            loc += file.read().count(b"\n")
+    return {**_rates(seconds, len(files), loc), "peak_rss_mb": peak_rss_mb(), "smells": smells}
+
+
+def measure_stages(corpus, only=None):
+    """
+    Mede, arquivo a arquivo e no próprio processo, o tempo de cada etapa da análise:
+    leitura, pylint e cada checker (os checkers que não usam o pylint formam o tempo "nativo").
+
+    Returns:
+        dict: Tempo total, em segundos, de cada etapa e de cada checker.
+    """
+    checkers = select_checkers(only)
+    engine = PylintEngine() if needs_pylint(checkers) else None
+    stages = {"read": 0.0, "pylint": 0.0, "native": 0.0, "checkers": dict.fromkeys(smell_names(), 0.0)}
+
+    for file_path in iter_python_files(corpus):
+        started = time.perf_counter()
+        ctx = FileContext.from_path(file_path)
+        stages["read"] += time.perf_counter() - started
+
+        messages = None
+        if engine is not None:
+            started = time.perf_counter()
+            messages = engine.run(file_path)
+            stages["pylint"] += time.perf_counter() - started
+
+        for checker in checkers:
+            started = time.perf_counter()
+            checker.run(ctx, messages)
+            elapsed = time.perf_counter() - started
+            stages["checkers"][checker.smell] += elapsed
+            if PYLINT not in checker.requires:
+                stages["native"] += elapsed
+
+    stages["checkers"] = {smell: round(seconds, 4) for smell, seconds in stages["checkers"].items()
+                          if any(checker.smell == smell for checker in checkers)}
+    for stage in ("read", "pylint", "native"):
+        stages[stage] = round(stages[stage], 4)
+    return stages
+
+
+def _run_worker(task):
+    """Executa uma medição em um processo novo, para isolar o pico de memória e os caches."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", json.dumps(task)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _best(runs):
+    """Melhor de várias execuções (menor tempo); o pico de memória é o maior observado."""
+    best = min(runs, key=lambda run: run["seconds"])
+    peaks = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {**best, "peak_rss_mb": max(peaks) if peaks else None}
+
+
+def run_benchmark(corpora, jobs=1, repeat=1, pylint_in_process=True, per_checker=True):
+    """
+    Mede o desempenho do Scylla em cada corpus.
+
+    Para cada corpus são medidas a análise completa, a análise com cada
+    checker isolado e o tempo de cada etapa (leitura, pylint e checkers).
+    Cada medição roda em um processo novo; com `repeat` > 1, vale a mais
+    rápida.
+
+    Args:
+        corpora (List[str]): Diretórios a analisar.
+        jobs (int): Quantidade de processos de análise.
+        repeat (int): Quantidade de execuções de cada medição.
+        pylint_in_process (bool): Executa o pylint no próprio processo.
+        per_checker (bool): Também mede cada checker isoladamente.
+
+    Returns:
+        dict: Resultados, prontos para serem gravados em JSON.
+    """
+    results = {
+        "scylla": __version__,
+        "pylint": pylint.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jobs": jobs,
+        "pylint_in_process": pylint_in_process,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "corpora": [],
+    }
+
+    for corpus in corpora:
+        files = list(iter_python_files(corpus))
+        loc = 0
+        for file_path in files:
+            with open(file_path, "rb") as file:
+                loc += file.read().count(b"\n")
+        entry = {"name": os.path.basename(os.path.normpath(corpus)), "path": corpus,
+                 "files": len(files), "loc": loc}
+
+        task = {"kind": "pipeline", "corpus": corpus, "jobs": jobs, "pylint_in_process": pylint_in_process}
+        entry["pipeline"] = _best([_run_worker(task) for _ in range(repeat)])
+        if per_checker:
+            entry["checkers"] = {
+                smell: _best([_run_worker({**task, "only": [smell]}) for _ in range(repeat)])
+                for smell in smell_names()
+            }
+        entry["stages"] = min(
+            (_run_worker({"kind": "stages", "corpus": corpus}) for _ in range(repeat)),
+            key=lambda stages: stages["read"] + stages["pylint"] + stages["native"],
+        )
+        results["corpora"].append(entry)
+        print_corpus(entry)
+
+    return results
+
+
+def print_corpus(entry):
+    pipeline = entry["pipeline"]
+    stages = entry["stages"]
+    print(f"{entry['name']}: {entry['files']} arquivos, {entry['loc']} linhas")
+    print(f"  análise completa: {pipeline['seconds']:.2f}s, {pipeline['files_per_second']} arquivos/s, "
+          f"{pipeline['loc_per_second']} linhas/s, pico de {pipeline['peak_rss_mb']} MB")
+    print(f"  etapas: leitura {stages['read']:.2f}s, pylint {stages['pylint']:.2f}s, "
+          f"nativo {stages['native']:.2f}s")
+    for smell, measure in entry.get("checkers", {}).items():
+        print(f"  {smell}: {measure['seconds']:.2f}s, {measure['files_per_second']} arquivos/s, "
+              f"pico de {measure['peak_rss_mb']} MB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do Scylla nos corpora de avaliação.")
+    parser.add_argument("--corpus", action="append", metavar="DIR",
+                        help=f"Diretório a medir (pode ser repetido). Padrão: cada diretório de "
+                             f"'{DEFAULT_CORPORA_DIR}'.")
+    parser.add_argument("-o", "--output", default="benchmark.json",
+                        help="Arquivo JSON com os resultados.")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Quantidade de processos de análise (0 usa todos os núcleos).")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Execuções de cada medição; vale a mais rápida.")
+    parser.add_argument("--no-checkers", action="store_true",
+                        help="Não mede cada checker isoladamente.")
+    parser.add_argument("--pylint-subprocess", action="store_true",
+                        help="Executa o pylint em subprocessos em vez de no próprio processo.")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.worker:
+        task = json.loads(args.worker)
+        if task["kind"] == "pipeline":
+            measure = measure_pipeline(task["corpus"], task.get("only"), task["jobs"], task["pylint_in_process"])
+        else:
+            measure = measure_stages(task["corpus"], task.get("only"))
+        print(json.dumps(measure))
+        sys.exit(0)
+
+    corpora = args.corpus or default_corpora()
+    if not corpora:
+        sys.exit("Nenhum corpus encontrado; informe --corpus.")
+    results = run_benchmark(corpora, jobs=args.jobs, repeat=max(args.repeat, 1),
+                            pylint_in_process=not args.pylint_subprocess, per_checker=not args.no_checkers)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, ensure_ascii=False)
+    print(f"Resultados salvos no arquivo {args.output}")
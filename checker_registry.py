@@ -0,0 +1,103 @@
+# checker_registry.py
+
+from typing import Callable, FrozenSet, List, NamedTuple, Tuple
+
+# Dados de entrada que um checker pode exigir
+LINES = "lines"
+AST = "ast"
+TOKENS = "tokens"
+PYLINT = "pylint"
+
+
+class Checker(NamedTuple):
+    """Checker registrado, com o code smell que detecta e os dados de que precisa."""
+    smell: str
+    function: Callable
+    requires: FrozenSet[str]
+    visitors: Tuple[type, ...] = ()
+
+    def run(self, ctx, pylint_messages=None, options=None):
+        """
+        Executa o checker em um arquivo.
+
+        Args:
+            ctx (FileContext): Contexto do arquivo.
+            pylint_messages (List[PylintMessage]): Mensagens do pylint, se exigidas.
+            options (Dict[str, dict]): Argumentos extras por code smell, repassados
+                ao checker correspondente.
+        """
+        kwargs = (options or {}).get(self.smell, {})
+        if PYLINT in self.requires:
+            return self.function(ctx, pylint_messages, **kwargs)
+        return self.function(ctx, **kwargs)
+
+
+_checkers = []
+
+
+def register_checker(smell, *requires, visitors=()):
+    """
+    Decorator que registra um checker.
+
+    A função decorada recebe o `FileContext` do arquivo e, se exigir `PYLINT`,
+    também a lista de mensagens do pylint.
+
+    Args:
+        smell (str): Nome do code smell detectado.
+        *requires (str): Dados exigidos: `LINES`, `AST`, `TOKENS` e/ou `PYLINT`.
+        visitors (Tuple[type, ...]): Visitors estruturais (ver `ast_engine`) consultados
+            pelo checker com `FileContext.visitor`.
+    """
+    def decorator(function):
+        _checkers.append(Checker(smell, function, frozenset(requires), tuple(visitors)))
+        return function
+    return decorator
+
+
+def _normalize(name):
+    return "".join(char for char in name.lower() if char.isalnum())
+
+
+def smell_names():
+    return [checker.smell for checker in _checkers]
+
+
+def select_checkers(only=None, skip=None) -> List[Checker]:
+    """
+    Seleciona os checkers a executar, na ordem de registro.
+
+    Os nomes são comparados sem diferenciar maiúsculas, espaços e hífens
+    (`long-method` equivale a `Long Method`).
+
+    Args:
+        only (List[str]): Code smells a executar. None executa todos.
+        skip (List[str]): Code smells a não executar.
+
+    Returns:
+        List[Checker]: Checkers selecionados.
+
+    Raises:
+        ValueError: Se algum nome não corresponder a um checker registrado.
+    """
+    known = {_normalize(checker.smell) for checker in _checkers}
+    unknown = [name for name in (only or []) + (skip or []) if _normalize(name) not in known]
+    if unknown:
+        raise ValueError(f"Code smell desconhecido: {', '.join(unknown)}. "
+                         f"Opções: {', '.join(smell_names())}")
+
+    only = {_normalize(name) for name in only} if only else None
+    skip = {_normalize(name) for name in skip or []}
+    return [
+        checker for checker in _checkers
+        if (only is None or _normalize(checker.smell) in only) and _normalize(checker.smell) not in skip
+    ]
+
+
+def checker_visitors(checkers) -> List[type]:
+    """Visitors estruturais usados pelos checkers, sem repetição e na ordem de registro."""
+    return list(dict.fromkeys(visitor for checker in checkers for visitor in checker.visitors))
+
+
+def needs_pylint(checkers) -> bool:
+    """Indica se algum dos checkers depende das mensagens do pylint."""
+    return any(PYLINT in checker.requires for checker in checkers)
@@ -4,66 +4,130 @@ import ast
 import os
 import re
 import subprocess
-from typing import List, Tuple
-from collections import defaultdict
-from funcAux import detect_unused_functions_with_lines, detect_unused_classes_with_lines, contar_linhas_classe
+from typing import List
+from ast_engine import StructuralVisitor
+from checker_registry import AST, LINES, PYLINT, register_checker
+from file_context import FileContext
+from project_index import CLASS
+from smell import PATHS, Smell, SmellKind
+from pylint_utils import PylintMessage
+from funcAux import DefinitionsAndCallsVisitor, detect_unused_functions_with_lines, detect_unused_classes_with_lines
+
+# Limites usados pelos checkers
+LONG_METHOD_MAX_LINES = 67
+LARGE_CLASS_MAX_LINES = 200
+LARGE_CLASS_MAX_ATTRIBUTES_METHODS = 40
+MAGIC_NUMBER_ALLOWED = (0, 1)
+
+THRESHOLDS = {
+    "long_method_max_lines": LONG_METHOD_MAX_LINES,
+    "large_class_max_lines": LARGE_CLASS_MAX_LINES,
+    "large_class_max_attributes_methods": LARGE_CLASS_MAX_ATTRIBUTES_METHODS,
+    "magic_number_allowed": MAGIC_NUMBER_ALLOWED,
+}
 
 #--------------------------------------------------------------------------------------#
-def check_too_many_arguments(file_path, pylint_output):
+def message_count(message: PylintMessage) -> int:
+    """Extrai a contagem de mensagens no formato "... (contagem/limite)"."""
+    match = re.search(r"\((\d+)/[^\)]+\)", message.message)
+    return int(match.group(1)) if match else 0
+
+
+@register_checker(SmellKind.TOO_MANY_ARGUMENTS.value, PYLINT)
+def check_too_many_arguments(ctx, pylint_messages):
     """Verifica e retorna as linhas com funções contendo muitos argumentos."""
-    too_many_args_matches = re.findall(r"(\d+):\d+: R0913: Too many arguments \((\d+)/[^\)]+\)", pylint_output)
     code_smells = []
     
-    for line_number, num_arguments in too_many_args_matches:
-        line_number = int(line_number)
-        num_arguments = int(num_arguments)
-        description = f"A função possui {num_arguments} argumentos, excedendo o limite recomendado."
-        code_smells.append((file_path, line_number, line_number, "Too Many Arguments", description))
+    for message in pylint_messages:
+        if message.msg_id != "R0913":
+            continue
+        line_number = message.line
+        num_arguments = message_count(message)
+        code_smells.append(Smell.at(ctx.path, line_number, line_number, SmellKind.TOO_MANY_ARGUMENTS, num_arguments))
     
     return code_smells
 
 
 #--------------------------------------------------------------------------------------#
-def check_long_method(file_path, max_lines=67):
-    """Verifica e retorna as linhas de funções que excedem um limite de linhas."""
+class FunctionRangeVisitor(StructuralVisitor):
+    """Coleta o intervalo de linhas de cada função e de cada docstring."""
+
+    node_types = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+    def __init__(self):
+        self.functions = []  # (nome da função, linha inicial, linha final)
+        self.docstrings = []  # (linha inicial, linha final)
+
+    def visit(self, node):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.functions.append((node.name, node.lineno, node.end_lineno))
+        first = node.body[0] if node.body else None
+        if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)):
+            self.docstrings.append((first.lineno, first.end_lineno))
+
+
+def count_logical_lines(ctx, start, end, docstring_lines):
+    """Conta as linhas de [start, end] que não são vazias, comentários ou docstrings."""
+    count = 0
+    for line_number in range(start, end + 1):
+        line = ctx.lines[line_number - 1].strip()
+        if line and not line.startswith("#") and line_number not in docstring_lines:
+            count += 1
+    return count
+
+
+@register_checker(SmellKind.LONG_METHOD.value, AST, visitors=(FunctionRangeVisitor,))
+def check_long_method(ctx, max_lines=LONG_METHOD_MAX_LINES, logical=False):
+    """
+    Verifica e retorna as funções (inclusive `async def`, métodos e funções
+    aninhadas) que excedem um limite de linhas.
+
+    O intervalo reportado vai da linha do `def` até a última linha do corpo.
+
+    Args:
+        ctx (FileContext): Contexto do arquivo analisado.
+        max_lines (int): Quantidade máxima de linhas de uma função.
+        logical (bool): Mede apenas as linhas lógicas, desconsiderando linhas
+            vazias, comentários e docstrings.
+    """
+    path_id = PATHS.intern(ctx.path)
+    visitor = ctx.visitor(FunctionRangeVisitor)
+
+    docstring_lines = set()
+    if logical:
+        for start, end in visitor.docstrings:
+            docstring_lines.update(range(start, end + 1))
 
-    
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
-    
-    function_start = None
     functions_with_long_methods = []
-    
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if line.startswith("def "):
-            if function_start is not None and (i - function_start) > max_lines:
-                linhas = contar_linhas_classe(file_path, function_start)
-                functions_with_long_methods.append((file_path, function_start + 1, function_start+linhas , "Long Method"," Total de linhas: " + str(i - function_start)))
-                
-            function_start = i
-    
-    if function_start is not None and (len(lines) - function_start) > max_lines:
-        linhas = contar_linhas_classe(file_path, function_start)
-        functions_with_long_methods.append((file_path, function_start + 1, function_start+linhas, "Long Method","Total de linhas: " + str(len(lines) - function_start)))
-        
-    
+    for _, start, end in sorted(visitor.functions, key=lambda function: function[1]):
+        if logical:
+            linhas = count_logical_lines(ctx, start, end, docstring_lines)
+            args = ("lógicas", linhas)
+        else:
+            linhas = end - start + 1
+            args = linhas
+        if linhas > max_lines:
+            functions_with_long_methods.append(Smell(path_id, start, end, SmellKind.LONG_METHOD, args))
+
     return functions_with_long_methods
 
 #--------------------------------------------------------------------------------------#
 
-def check_lc(file_path, pylint_output, max_lines=200, max_attributes_methods=40):
-    # Encontra padrões de classes e métodos no pylint_output
-    class_pattern = re.findall(r"(\d+):\d+: R0902: Too many instance attributes \((\d+)/\d+\)", pylint_output)
-    method_pattern = re.findall(r"(\d+):\d+: R0904: Too many public methods \((\d+)/\d+\)", pylint_output)
+@register_checker(SmellKind.LARGE_CLASS.value, PYLINT, LINES)
+def check_lc(ctx, pylint_messages, max_lines=LARGE_CLASS_MAX_LINES,
+             max_attributes_methods=LARGE_CLASS_MAX_ATTRIBUTES_METHODS):
+    # Encontra mensagens de classes e métodos entre as mensagens do pylint
+    class_messages = [m for m in pylint_messages if m.msg_id == "R0902"]
+    method_messages = [m for m in pylint_messages if m.msg_id == "R0904"]
 
     # Dicionário para armazenar a soma de atributos e métodos por linha
     class_metrics = {}
 
     # Processa classes com muitos atributos
-    for match in class_pattern:
-        line_number = int(match[0])  # linha onde o problema foi encontrado
-        attributes_count = int(match[1])  # contagem de atributos
+    for message in class_messages:
+        line_number = message.line  # linha onde o problema foi encontrado
+        attributes_count = message_count(message)  # contagem de atributos
 
         # Armazena a contagem de atributos
         if line_number not in class_metrics:
@@ -71,9 +135,9 @@ def check_lc(file_path, pylint_output, max_lines=200, max_attributes_methods=40)
         class_metrics[line_number]['attributes'] += attributes_count
 
     # Processa métodos públicos
-    for match in method_pattern:
-        line_number = int(match[0])  # linha onde o problema foi encontrado
-        methods_count = int(match[1])  # contagem de métodos
+    for message in method_messages:
+        line_number = message.line  # linha onde o problema foi encontrado
+        methods_count = message_count(message)  # contagem de métodos
 
         # Armazena a contagem de métodos
         if line_number not in class_metrics:
@@ -81,41 +145,38 @@ def check_lc(file_path, pylint_output, max_lines=200, max_attributes_methods=40)
         class_metrics[line_number]['methods'] += methods_count
 
     # Lista para armazenar classes com code smells
+    path_id = PATHS.intern(ctx.path)
     code_smells = []
 
     # Verifica se a soma de atributos e métodos ultrapassa o limite
     for line_number, metrics in class_metrics.items():
         total_count = metrics['attributes'] + metrics['methods']
-        linhas = contar_linhas_classe(file_path,line_number-1)
-        if total_count > max_attributes_methods:
-            code_smells.append(
-    (file_path, line_number, line_number + linhas, 
-     "Large Class: " , 
-     " Total de atributos: " + str(total_count) + ", Total de Linhas: " + str(linhas))
-)
-
-        elif linhas > max_lines:
-            code_smells.append(
-    (file_path, line_number, line_number + linhas, 
-     "Large Class: " , 
-     " Total de atributos: " + str(total_count) + ", Total de Linhas: " + str(linhas))
-)
+        # Fim do bloco da classe, consultado no índice de linhas do arquivo
+        end_line = ctx.line_index.block_end(line_number - 1) + 1
+        linhas = end_line - line_number + 1
+        if total_count > max_attributes_methods or linhas > max_lines:
+            code_smells.append(Smell(path_id, line_number, end_line, SmellKind.LARGE_CLASS, (total_count, linhas)))
 
     return code_smells
 
 #--------------------------------------------------------------------------------------#
 
-def check_dead_code(file_path: str, pylint_output: str) -> List[Tuple[str, int, int, str]]:
+@register_checker(SmellKind.DEAD_CODE.value, PYLINT, AST, visitors=(DefinitionsAndCallsVisitor,))
+def check_dead_code(ctx: FileContext, pylint_messages: List[PylintMessage],
+                    local_unused: bool = True) -> List[Smell]:
     """
-    Verifica e retorna trechos de código morto usando a saída do pylint
+    Verifica e retorna trechos de código morto usando as mensagens do pylint
     e análise estática de funções e classes não utilizadas.
 
     Args:
-        file_path (str): Caminho do arquivo analisado.
-        pylint_output (str): Saída do comando pylint.
+        ctx (FileContext): Contexto do arquivo analisado.
+        pylint_messages (List[PylintMessage]): Mensagens emitidas pelo pylint.
+        local_unused (bool): Procura funções e classes não utilizadas dentro do
+            próprio arquivo. Desativado quando a análise de código morto é feita
+            sobre o projeto inteiro (ver `project_index.ProjectIndex`).
 
     Returns:
-        List[Tuple[str, int, int, str]]: Lista de trechos de código morto com detalhes.
+        List[Smell]: Lista de trechos de código morto com detalhes.
     """
     # Mapeia códigos pylint para tipos de "dead code"
     dead_code_types = {
@@ -127,36 +188,82 @@ def check_dead_code(file_path: str, pylint_output: str) -> List[Tuple[str, int,
         "W0612": "Unused Local Variable",
     }
 
-    # Regex para capturar linhas e códigos do pylint que indicam "dead code"
-    dead_code_matches = re.findall(r"(\d+):\d+: ([A-Z]\d+): (.+)", pylint_output)
-
     # Lista para armazenar os resultados do pylint
+    path_id = PATHS.intern(ctx.path)
     code_smells = []
 
-    for line_number, code, message in dead_code_matches:
-        if code in dead_code_types:
-            line_number = int(line_number)
+    for message in pylint_messages:
+        if message.msg_id in dead_code_types:
+            line_number = message.line
             code_smells.append(
-                (file_path, line_number, line_number,"Dead Code", f"{dead_code_types[code]}: {message}")
+                Smell(path_id, line_number, line_number, SmellKind.DEAD_CODE,
+                      f"{dead_code_types[message.msg_id]}: {message.message} ({message.symbol})")
             )
 
+    if not local_unused:
+        return code_smells
+
     # Adiciona análise de funções e classes não utilizadas
-    unused_functions = detect_unused_functions_with_lines(file_path)
-    unused_classes = detect_unused_classes_with_lines(file_path)
+    unused_functions = detect_unused_functions_with_lines(ctx)
+    unused_classes = detect_unused_classes_with_lines(ctx)
 
     for func_name, line in unused_functions:
         code_smells.append(
-            (file_path, line, line,"Dead Code", f"Unused Function: {func_name}")
+            Smell(path_id, line, line, SmellKind.DEAD_CODE, f"Unused Function: {func_name}")
         )
 
     for class_name, line in unused_classes:
         code_smells.append(
-            (file_path, line, line,"Dead Code", f"Unused Class: {class_name}")
+            Smell(path_id, line, line, SmellKind.DEAD_CODE, f"Unused Class: {class_name}")
         )
 
     return code_smells
 
 
+def check_project_dead_code(project_index) -> List[Smell]:
+    """
+    Retorna as funções, métodos e classes não alcançáveis em todo o projeto.
+
+    Args:
+        project_index (ProjectIndex): Índice de símbolos de todos os arquivos analisados.
+
+    Returns:
+        List[Smell]: Code smells Dead Code, agrupados por arquivo.
+    """
+    code_smells = []
+    for file_path, line, name, kind in project_index.dead_code():
+        label = "Unused Class" if kind == CLASS else "Unused Function"
+        code_smells.append(Smell.at(file_path, line, line, SmellKind.DEAD_CODE, f"{label}: {name}"))
+    return code_smells
+
+
+def check_project_hierarchy(project_index, smells=(SmellKind.LAZY_CLASS.value, SmellKind.PARALLEL_INHERITANCE.value)):
+    """
+    Aplica Lazy Class e Parallel Inheritance Hierarchies à hierarquia de classes
+    do projeto inteiro, com as bases resolvidas pelas importações entre módulos.
+
+    Args:
+        project_index (ProjectIndex): Índice de símbolos de todos os arquivos analisados.
+        smells (Iterable[str]): Code smells a verificar.
+
+    Returns:
+        List[Smell]: Code smells encontrados, agrupados por arquivo.
+    """
+    hierarchy = project_index.class_hierarchy()
+    code_smells = []
+    for cls in hierarchy.classes:
+        depth = hierarchy.depth(cls.id)
+        if SmellKind.LAZY_CLASS.value in smells:
+            smell = _lazy_class_smell(cls.file, cls.name, cls.line, cls.methods, cls.attributes, depth)
+            if smell is not None:
+                code_smells.append(smell)
+        if SmellKind.PARALLEL_INHERITANCE.value in smells:
+            smell = _parallel_inheritance_smell(cls.file, cls.name, cls.line, depth, hierarchy.children(cls.id))
+            if smell is not None:
+                code_smells.append(smell)
+    return code_smells
+
+
 # --------------------------------------------------------------------------------------#
 
 
@@ -176,28 +283,47 @@ def extract_class_name(line_number: int, class_definitions: List[str]) -> str:
             return class_definitions[i].split()[1].split("(")[0]
     return "Unknown"
 
+# --------------------------------------------------------------------------------------#
+class LazyClassVisitor(StructuralVisitor):
+    """Coleta a quantidade de métodos, atributos e classes base de cada classe."""
+
+    node_types = (ast.ClassDef,)
 
-def calculate_inheritance_depth(class_name: str, class_definitions: List[str]) -> int:
-    """
-    Calcula a profundidade da árvore de herança de uma classe.
+    def __init__(self):
+        self.classes = []  # (classe, linha, métodos, atributos, profundidade de herança)
 
-    Args:
-        class_name (str): Nome da classe.
-        class_definitions (List[str]): Conteúdo do arquivo com definições de classes.
+    def visit(self, node):
+        # Count methods in the class
+        num_methods = sum(
+            1 for n in node.body if isinstance(n, ast.FunctionDef) and not n.name.startswith('__')
+        )
 
-    Returns:
-        int: Profundidade da herança.
-    """
-    for line in class_definitions:
-        if f"class {class_name}" in line:
-            if "(" in line and ")" in line:
-                return 2  # Herda de outra classe
-            else:
-                return 1  # Não herda de nenhuma classe
-    return 1  # Padrão, caso não encontre definição específica
+        # Count attributes in the class
+        num_attributes = sum(1 for n in node.body if isinstance(n, ast.Assign))
 
-# --------------------------------------------------------------------------------------#
-def detect_lazy_classes(file_path):
+        # Check inheritance depth
+        inheritance_depth = len(node.bases)
+
+        self.classes.append((node.name, node.lineno, num_methods, num_attributes, inheritance_depth))
+
+
+def _lazy_class_smell(file_path, class_name, line_number, num_methods, num_attributes, inheritance_depth):
+    """Aplica as regras de Lazy Class a uma classe e retorna o code smell (ou None)."""
+    method_attr_condition = (num_methods < 5) ^ (num_attributes < 5)
+    inheritance_condition = inheritance_depth < 2
+
+    if not (method_attr_condition or inheritance_condition):
+        return None
+    # As regras não violadas ficam de fora da descrição (ver `smell.SmellKind.LAZY_CLASS`)
+    args = (class_name,
+            num_methods if method_attr_condition else None,
+            num_attributes if method_attr_condition else None,
+            inheritance_depth if inheritance_condition else None)
+    return Smell.at(file_path, line_number, line_number, SmellKind.LAZY_CLASS, args)
+
+
+@register_checker(SmellKind.LAZY_CLASS.value, AST, visitors=(LazyClassVisitor,))
+def detect_lazy_classes(ctx, local_hierarchy=True):
 
     """
     Detect lazy classes in a Python file based on the following criteria:
@@ -205,103 +331,96 @@ def detect_lazy_classes(file_path):
     - OR has inheritance depth less than 2.
 
     Args:
-        file_path (str): Path to the Python file to analyze.
+        ctx (FileContext): Context of the Python file to analyze.
+        local_hierarchy (bool): If False, nothing is reported here; the classes are
+                                checked against the project-wide hierarchy instead
+                                (see `check_project_hierarchy`).
 
     Returns:
-        List[Tuple[str, int, str]]: List of tuples with lazy class details
-                                    (class_name, line_number, reason).
+        List[Smell]: Lazy classes found, one per class definition line.
     """
-    with open(file_path, 'r') as file:
-        file_content = file.read()
-    
-    # Parse the file into an AST
-    tree = ast.parse(file_content)
+    if not local_hierarchy:
+        return []
+
+    file_path = ctx.path
     
     lazy_classes = []
     
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef):
-            class_name = node.name
-            line_number = node.lineno
-
-            # Count methods in the class
-            methods = [
-                n for n in node.body if isinstance(n, ast.FunctionDef) and not n.name.startswith('__')
-            ]
-            num_methods = len(methods)
-
-            # Count attributes in the class
-            attributes = [
-                n for n in node.body if isinstance(n, ast.Assign)
-            ]
-            num_attributes = len(attributes)
-
-            # Check inheritance depth
-            inheritance_depth = len(node.bases)
-
-            # Lazy class detection rules
-            method_attr_condition = (num_methods < 5) ^ (num_attributes < 5)
-            inheritance_condition = inheritance_depth < 2
-
-            if method_attr_condition or inheritance_condition:
-                reason = []
-                if method_attr_condition:
-                    reason.append(f"Methods < 5 XOR Attributes < 5 (methods={num_methods}, attributes={num_attributes})")
-                if inheritance_condition:
-                    reason.append(f"Inheritance depth < 2 (depth={inheritance_depth})")
-                lazy_classes.append((file_path, line_number,line_number, "Lazy Class: " + class_name, "; ".join(reason)))
+    for class_name, line_number, num_methods, num_attributes, inheritance_depth in ctx.visitor(LazyClassVisitor).classes:
+        smell = _lazy_class_smell(file_path, class_name, line_number, num_methods, num_attributes, inheritance_depth)
+        if smell is not None:
+            lazy_classes.append(smell)
     
     return lazy_classes
 
-def detect_parallel_inheritance(file_path):
+
+class ClassHierarchyVisitor(StructuralVisitor):
+    """Coleta as definições de classe e os nomes das suas classes base."""
+
+    node_types = (ast.ClassDef,)
+
+    def __init__(self):
+        self.class_bases = {}  # classe -> (linha, classes base)
+
+    def visit(self, node):
+        # Get base classes for the current class
+        base_classes = [
+            base.id for base in node.bases if isinstance(base, ast.Name)
+        ]
+        self.class_bases[node.name] = (node.lineno, base_classes)
+
+
+def _parallel_inheritance_smell(file_path, class_name, line_number, depth, children):
+    """Aplica as regras de Parallel Inheritance Hierarchies a uma classe e retorna o code smell (ou None)."""
+    depth_condition = depth > 3
+    child_condition = children > 4
+
+    if not (depth_condition or child_condition):
+        return None
+    args = (class_name, depth if depth_condition else None, children if child_condition else None)
+    return Smell.at(file_path, line_number, line_number, SmellKind.PARALLEL_INHERITANCE, args)
+
+
+@register_checker(SmellKind.PARALLEL_INHERITANCE.value, AST, visitors=(ClassHierarchyVisitor,))
+def detect_parallel_inheritance(ctx, local_hierarchy=True):
     """
     Detect Parallel Inheritance Hierarchy in a Python file based on:
     - Depth of inheritance tree > 3.
     - Number of direct child classes > 4.
 
     Args:
-        file_path (str): Path to the Python file to analyze.
+        ctx (FileContext): Context of the Python file to analyze.
+        local_hierarchy (bool): If False, nothing is reported here; the classes are
+                                checked against the project-wide hierarchy instead
+                                (see `check_project_hierarchy`).
 
     Returns:
-        List[Tuple[str, int, str]]: List of tuples with Parallel Inheritance details
-                                    (class_name, line_number, reason).
+        List[Smell]: Parallel Inheritance Hierarchies found, one per class definition line.
     """
-    with open(file_path, 'r') as file:
-        file_content = file.read()
-    
-    # Parse the file into an AST
-    tree = ast.parse(file_content)
+    if not local_hierarchy:
+        return []
+
+    file_path = ctx.path
     
     # Store class definitions and their base classes
-    class_definitions = {}
-    class_hierarchy = defaultdict(list)  # Maps base class -> list of child classes
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef):
-            class_name = node.name
-            line_number = node.lineno
-
-            # Get base classes for the current class
-            base_classes = [
-                base.id for base in node.bases if isinstance(base, ast.Name)
-            ]
-
-            class_definitions[class_name] = {
-                "line": line_number,
-                "bases": base_classes,
-                "children": 0,  # To track the number of direct children
-            }
-
-            # Map class to its parents
-            for base in base_classes:
-                class_hierarchy[base].append(class_name)
+    class_definitions = {
+        class_name: {
+            "line": line_number,
+            "bases": base_classes,
+            "children": 0,  # To track the number of direct children
+        }
+        for class_name, (line_number, base_classes) in ctx.visitor(ClassHierarchyVisitor).class_bases.items()
+    }
 
     # Calculate depth of inheritance tree and child counts
     for cls_name, cls_info in class_definitions.items():
         # Calculate the inheritance depth
         depth = 0
         current_class = cls_name
-        while current_class in class_definitions and class_definitions[current_class]["bases"]:
+        visited = set()
+        while (current_class in class_definitions and class_definitions[current_class]["bases"]
+               and current_class not in visited):
+            visited.add(current_class)  # Guard against cyclic bases
             depth += 1
             current_class = class_definitions[current_class]["bases"][0]  # Move up the inheritance tree
         
@@ -315,48 +434,110 @@ def detect_parallel_inheritance(file_path):
     # Detect Parallel Inheritance Hierarchies
     parallel_inheritance = []
     for cls_name, cls_info in class_definitions.items():
-        depth_condition = cls_info["depth"] > 3
-        child_condition = cls_info["children"] > 4
-
-        if depth_condition or child_condition:
-            reason = []
-            if depth_condition:
-                reason.append(f"Inheritance depth > 3 (depth={cls_info['depth']})")
-            if child_condition:
-                reason.append(f"Number of child classes > 4 (children={cls_info['children']})")
-            parallel_inheritance.append((file_path, cls_info["line"],cls_info["line"],"Parallel Inheritance Hierarchies: " + cls_name, "; ".join(reason)))
+        smell = _parallel_inheritance_smell(file_path, cls_name, cls_info["line"], cls_info["depth"], cls_info["children"])
+        if smell is not None:
+            parallel_inheritance.append(smell)
     
     return parallel_inheritance
 
 
-def check_magic_numbers(file_path: str) -> List[Tuple[str, int, int, str, str]]:
+def _is_numeric_literal(node):
+    """Indica se o nó é um literal numérico (ex.: `30`, `-1.5`) ou uma tupla deles (ex.: `(3, 7)`)."""
+    if isinstance(node, ast.Tuple):
+        return bool(node.elts) and all(_is_numeric_literal(element) for element in node.elts)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        node = node.operand
+    return (isinstance(node, ast.Constant) and isinstance(node.value, (int, float, complex))
+            and not isinstance(node.value, bool))
+
+
+def _is_constant_name(target):
+    """Indica se o alvo é um nome no padrão de constantes, em maiúsculas (ex.: `MAX_RETRIES`)."""
+    return isinstance(target, ast.Name) and target.id.isupper()
+
+
+def _is_named_definition(statement):
+    """
+    Indica se o comando define uma constante nomeada: um literal numérico (ou uma
+    tupla deles) atribuído apenas a nomes em maiúsculas (ex.: `TIMEOUT = 30`).
+    Números atribuídos a variáveis comuns ou dentro de chamadas, listas,
+    dicionários e outras expressões continuam sendo reportados.
+    """
+    if isinstance(statement, ast.Assign):
+        return all(_is_constant_name(target) for target in statement.targets) and _is_numeric_literal(statement.value)
+    if isinstance(statement, ast.AnnAssign):
+        return (statement.value is not None and _is_constant_name(statement.target)
+                and _is_numeric_literal(statement.value))
+    return False
+
+
+class MagicNumberVisitor(StructuralVisitor):
+    """
+    Coleta os literais numéricos fora dos contextos em que um número é esperado.
+
+    Contextos permitidos: constantes nomeadas de módulo ou de classe (ver
+    `_is_named_definition`), valores padrão de argumentos e índices (subscripts e
+    slices). Como o `ast.walk` visita os pais antes dos filhos, esses contextos são
+    marcados antes que os seus literais sejam visitados.
+    """
+
+    node_types = (
+        ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda,
+        ast.Subscript, ast.Constant,
+    )
+
+    def __init__(self):
+        self.allowed = set()  # ids dos literais em contextos permitidos
+        self.magic_numbers = []  # (linha inicial, linha final)
+
+    def _allow(self, node):
+        # Lambdas são código, não valores: o corpo delas não é um contexto permitido
+        stack = [node]
+        while stack:
+            child = stack.pop()
+            if isinstance(child, ast.Constant):
+                self.allowed.add(id(child))
+            elif not isinstance(child, ast.Lambda):
+                stack.extend(ast.iter_child_nodes(child))
+
+    def visit(self, node):
+        if isinstance(node, ast.Constant):
+            value = node.value
+            if (isinstance(value, (int, float, complex)) and not isinstance(value, bool)
+                    and value not in MAGIC_NUMBER_ALLOWED and id(node) not in self.allowed):
+                self.magic_numbers.append((node.lineno, node.end_lineno))
+        elif isinstance(node, (ast.Module, ast.ClassDef)):
+            for statement in node.body:
+                if _is_named_definition(statement):
+                    self._allow(statement.value)
+        elif isinstance(node, ast.Subscript):
+            self._allow(node.slice)
+        else:
+            for default in node.args.defaults + node.args.kw_defaults:
+                if default is not None:
+                    self._allow(default)
+
+
+@register_checker(SmellKind.MAGIC_NUMBER.value, AST, visitors=(MagicNumberVisitor,))
+def check_magic_numbers(ctx: FileContext) -> List[Smell]:
     """
     Verifica a presença de Magic Numbers no código-fonte.
 
+    Apenas literais numéricos reais são considerados (números dentro de
+    strings, comentários e identificadores são ignorados). Os valores 0 e 1
+    (e, portanto, -1) são permitidos, assim como números em constantes
+    nomeadas de módulo ou de classe, valores padrão de argumentos e índices.
+
     Args:
-        file_path (str): Caminho do arquivo a ser analisado.
+        ctx (FileContext): Contexto do arquivo a ser analisado.
 
     Returns:
-        List[Tuple[str, int, int, str, str]]: Lista de ocorrências do code smell Magic Number.
+        List[Smell]: Lista de ocorrências do code smell Magic Number.
     """
-    magic_number_pattern = re.compile(r'(?<!["\'])\b(-?(?!0\b)\d+(\.\d*)?)\b(?!["\'])')
-    allowed_numbers = {"0", "1", "-1"}
     code_smells = []
 
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
-        lines = file.readlines()
-
-    for line_number, line in enumerate(lines, start=1):
-        matches = magic_number_pattern.findall(line)
-        for match in matches:
-            number = match[0]  # O número capturado
-
-            if number not in allowed_numbers:
-                code_smells.append((
-                    file_path, line_number, line_number,
-                    "Magic Number",
-                    "When there is a numerical literal, except commonly used 0, -1, and 1, without any definition for that."
-                ))
+    path_id = PATHS.intern(ctx.path)
+    for line_number, end_line_number in sorted(ctx.visitor(MagicNumberVisitor).magic_numbers):
+        code_smells.append(Smell(path_id, line_number, end_line_number, SmellKind.MAGIC_NUMBER))
 
     return code_smells
-
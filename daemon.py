@@ -0,0 +1,461 @@
+# daemon.py
+
+import hashlib
+import inspect
+import json
+import os
+import queue
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future
+
+from analyzer import analyze_contexts, forget_files, project_findings, project_setup
+from file_context import FileContext
+from file_watcher import create_watcher
+from result_cache import DEFAULT_CACHE_FILE
+from version import __version__
+from walker import iter_python_files
+
+# Códigos de erro do JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Erro do servidor (faixa -32000 a -32099): requisição recebida durante o encerramento
+SHUTTING_DOWN = -32000
+
+# Tempo máximo de espera, no encerramento, pelas respostas ainda não escritas
+_CLOSE_TIMEOUT_SECONDS = 5
+
+
+class RpcError(Exception):
+    """Erro devolvido ao cliente na resposta JSON-RPC."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def smell_to_json(smell):
+    """Converte um `Smell` no objeto devolvido pelo daemon."""
+    return {
+        "path": smell.path,
+        "start": smell.start,
+        "end": smell.end,
+        "smell": smell.label,
+        "description": smell.description,
+    }
+
+
+def _file_status(path):
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+    return status.st_mtime_ns, status.st_size
+
+
+class AnalysisDaemon:
+    """
+    Estado de análise mantido em memória entre requisições.
+
+    Guarda, por arquivo, o resultado da última análise junto com a data de
+    modificação e o hash do conteúdo: arquivos que não mudaram são respondidos
+    sem serem relidos, e os que mudaram são reanalisados com o engine do
+    pylint já carregado (depois de descartados do cache do astroid). Buffers
+    ainda não salvos são analisados sem alterar o estado dos arquivos em disco.
+
+    Com code smells do projeto inteiro, o diretório é percorrido uma única vez
+    e depois observado (ver `file_watcher`): a cada requisição, apenas os
+    arquivos alterados desde a anterior são reanalisados e substituídos no
+    índice do projeto, mantido entre as requisições.
+
+    As requisições seguem o JSON-RPC 2.0, uma por linha. Métodos:
+
+    - `analyze` (`{"paths": [...]}`): analisa arquivos e diretórios.
+    - `analyze_buffer` (`{"path": ..., "source": ...}`): analisa o conteúdo
+      informado como se fosse o arquivo `path`.
+    - `status`: versão e quantidade de arquivos em memória.
+    - `shutdown`: encerra o daemon.
+
+    Args:
+        root (str): Diretório do projeto, usado para expandir caminhos relativos
+            e para os code smells do projeto inteiro.
+        Demais argumentos: os mesmos de `check_code_smells_in_directory`.
+    """
+
+    def __init__(self, root=".", pylint_in_process=True, exclude=(), use_gitignore=True,
+                 cache_file=DEFAULT_CACHE_FILE, only=None, skip=None, checker_options=None,
+                 project_dead_code=False, project_hierarchy=False, limits=None):
+        self.root = os.path.abspath(root)
+        self.exclude = exclude
+        self.use_gitignore = use_gitignore
+        self.project_smells, options, self._index = project_setup(
+            self.root, only, skip, checker_options, project_dead_code, project_hierarchy)
+        self.project = self._index is not None
+        self._watcher = None
+        self._findings = None  # code smells do projeto, enquanto o índice não muda
+        self.analysis = dict(pylint_in_process=pylint_in_process, cache_file=cache_file, only=only,
+                             skip=skip, options=options, summaries=self.project, limits=limits)
+        self.stopped = threading.Event()
+        self._files = {}  # caminho -> (mtime e tamanho, FileResult, hash do conteúdo)
+        self._buffers = {}  # caminho -> (hash do conteúdo, FileResult)
+        self._buffer_dir = None
+        self._lock = threading.Lock()
+        self._methods = {
+            "analyze": self.analyze,
+            "analyze_buffer": self.analyze_buffer,
+            "status": self.status,
+            "shutdown": self.shutdown,
+        }
+
+    def _expand(self, paths):
+        files = []
+        for path in paths:
+            path = os.path.abspath(os.path.join(self.root, path))
+            if os.path.isdir(path):
+                files.extend(iter_python_files(path, exclude=self.exclude, use_gitignore=self.use_gitignore))
+            else:
+                files.append(path)
+        return list(dict.fromkeys(files))
+
+    def _analyze(self, contexts, errors, lint_paths=None):
+        """Analisa cada contexto isoladamente, registrando erros de sintaxe e limites excedidos sem interromper os demais."""
+        results = []
+        for ctx in contexts:
+            try:
+                for result in analyze_contexts([ctx], lint_paths=lint_paths, **self.analysis):
+                    if result.skipped:
+                        errors.append({"path": ctx.path, "line": None, "message": result.skipped})
+                    else:
+                        results.append(result)
+            except SyntaxError as error:
+                errors.append({"path": ctx.path, "line": error.lineno, "message": error.msg})
+        return results
+
+    def _refresh(self, paths, errors):
+        """Atualiza os resultados em memória dos arquivos, reanalisando apenas os que mudaram."""
+        contexts = []
+        for path in paths:
+            status = _file_status(path)
+            entry = self._files.get(path)
+            if status is None:
+                if self._files.pop(path, None) is not None:
+                    self._index_file(path, None)
+                continue
+            if entry is not None and entry[0] == status:
+                continue
+            ctx = FileContext.from_path(path)
+            if entry is not None and entry[2] == ctx.content_hash:
+                self._files[path] = (status, entry[1], entry[2])
+                continue
+            contexts.append((status, ctx))
+
+        forget_files(ctx.path for _, ctx in contexts)
+        statuses = {ctx.path: (status, ctx.content_hash) for status, ctx in contexts}
+        for result in self._analyze([ctx for _, ctx in contexts], errors):
+            status, content_hash = statuses[result.path]
+            self._files[result.path] = (status, result, content_hash)
+            self._index_file(result.path, result)
+
+    def _index_file(self, path, result):
+        """Substitui (ou retira, com `result` None) o resumo do arquivo no índice do projeto."""
+        if not self.project:
+            return
+        if result is not None and result.summary is not None:
+            self._index.add(path, result.summary)
+        else:
+            self._index.remove(path)
+        self._findings = None
+
+    def _project_findings(self, errors, buffer=None):
+        """Code smells do projeto inteiro, com o buffer (se houver) no lugar do arquivo em disco."""
+        # Os code smells do projeto dependem de todos os arquivos, não só dos pedidos
+        if self._watcher is None:
+            self._watcher = create_watcher(self.root, exclude=self.exclude, use_gitignore=self.use_gitignore)
+            self._refresh(self._watcher.files(), errors)
+        else:
+            self._refresh(sorted(self._watcher.changes()), errors)
+
+        if buffer is None:
+            if self._findings is None:
+                self._findings = project_findings(self._index, self.project_smells)
+            return self._findings
+
+        entry, findings = self._files.get(buffer.path), self._findings
+        self._index_file(buffer.path, buffer)
+        try:
+            return project_findings(self._index, self.project_smells)
+        finally:
+            self._index_file(buffer.path, entry[1] if entry is not None else None)
+            self._findings = findings
+
+    def _respond(self, paths, errors, buffer=None):
+        """Monta a resposta com os code smells dos arquivos pedidos."""
+        results = {path: self._files[path][1] for path in paths if path in self._files}
+        if buffer is not None:
+            results[buffer.path] = buffer
+
+        smells = [smell for result in results.values() for smell in result.smells]
+        if self.project:
+            smells.extend(smell for smell in self._project_findings(errors, buffer) if smell.path in results)
+
+        return {"files": len(results), "smells": [smell_to_json(smell) for smell in smells], "errors": errors}
+
+    def analyze(self, paths):
+        """Analisa arquivos e diretórios, reaproveitando os resultados dos que não mudaram."""
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            raise RpcError(INVALID_PARAMS, "`paths` deve ser uma lista de caminhos.")
+        errors = []
+        files = self._expand(paths)
+        self._refresh(files, errors)
+        return self._respond(files, errors)
+
+    def analyze_buffer(self, path, source):
+        """Analisa o conteúdo de um arquivo ainda não salvo, sem alterar o estado do arquivo em disco."""
+        if not isinstance(path, str) or not isinstance(source, str):
+            raise RpcError(INVALID_PARAMS, "`path` e `source` devem ser strings.")
+        path = self._expand([path])[0]
+        content_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        errors = []
+
+        entry = self._buffers.get(path)
+        if entry is not None and entry[0] == content_hash:
+            return self._respond([], errors, entry[1])
+
+        # O pylint lê do disco: o buffer é gravado em um arquivo temporário com o mesmo nome
+        if self._buffer_dir is None:
+            self._buffer_dir = tempfile.mkdtemp(prefix="scylla-")
+        lint_path = os.path.join(self._buffer_dir, os.path.basename(path))
+        with open(lint_path, "w", encoding="utf-8") as file:
+            file.write(source)
+        try:
+            results = self._analyze([FileContext(path, source, content_hash)], errors, {path: lint_path})
+        finally:
+            forget_files([lint_path])
+            os.remove(lint_path)
+
+        if not results:
+            return {"files": 0, "smells": [], "errors": errors}
+        self._buffers[path] = (content_hash, results[0])
+        return self._respond([], errors, results[0])
+
+    def status(self):
+        return {"version": __version__, "root": self.root, "files": len(self._files), "buffers": len(self._buffers)}
+
+    def shutdown(self):
+        self.stopped.set()
+        return None
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.close()
+        if self._buffer_dir is not None:
+            shutil.rmtree(self._buffer_dir, ignore_errors=True)
+
+    def _call(self, request):
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+            raise RpcError(INVALID_REQUEST, "Requisição JSON-RPC 2.0 inválida.")
+        method = self._methods.get(request["method"])
+        if method is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Método desconhecido: {request['method']}")
+        params = request.get("params", {})
+        try:
+            if isinstance(params, list):
+                arguments = inspect.signature(method).bind(*params)
+            else:
+                arguments = inspect.signature(method).bind(**params)
+        except TypeError as error:
+            raise RpcError(INVALID_PARAMS, str(error)) from error
+        return method(*arguments.args, **arguments.kwargs)
+
+    def _dispatch(self, request):
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            with self._lock:
+                result = self._call(request)
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RpcError as error:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": error.code, "message": error.message}}
+        except Exception as error:  # o daemon continua atendendo as próximas requisições
+            response = {"jsonrpc": "2.0", "id": request_id,
+                        "error": {"code": INTERNAL_ERROR, "message": f"{type(error).__name__}: {error}"}}
+        # Notificações (sem "id") não têm resposta
+        if isinstance(request, dict) and "id" not in request:
+            return None
+        return response
+
+    def handle_line(self, line):
+        """
+        Atende uma linha com uma requisição (ou um lote de requisições) JSON-RPC.
+
+        Returns:
+            Optional[str]: Resposta serializada, ou None se não houver resposta.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return json.dumps({"jsonrpc": "2.0", "id": None,
+                               "error": {"code": PARSE_ERROR, "message": "JSON inválido."}}, ensure_ascii=False)
+        if isinstance(request, list):
+            responses = [response for response in map(self._dispatch, request) if response is not None]
+            return json.dumps(responses, ensure_ascii=False) if responses else None
+        response = self._dispatch(request)
+        return json.dumps(response, ensure_ascii=False) if response is not None else None
+
+    @staticmethod
+    def reject_line(line):
+        """
+        Responde com erro, sem executá-las, às requisições de uma linha recebida
+        durante o encerramento do daemon.
+
+        Returns:
+            Optional[str]: Resposta serializada, ou None se não houver resposta.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return json.dumps({"jsonrpc": "2.0", "id": None,
+                               "error": {"code": PARSE_ERROR, "message": "JSON inválido."}}, ensure_ascii=False)
+        requests = request if isinstance(request, list) else [request]
+        responses = [
+            {"jsonrpc": "2.0", "id": item.get("id") if isinstance(item, dict) else None,
+             "error": {"code": SHUTTING_DOWN, "message": "O daemon está sendo encerrado."}}
+            for item in requests if not (isinstance(item, dict) and "id" not in item)
+        ]
+        if isinstance(request, list):
+            return json.dumps(responses, ensure_ascii=False) if responses else None
+        return json.dumps(responses[0], ensure_ascii=False) if responses else None
+
+
+def serve_stdio(daemon, stdin=None, stdout=None):
+    """
+    Atende requisições lidas da entrada padrão, respondendo na saída padrão.
+
+    Enquanto o daemon executa, qualquer `print` é desviado para a saída de
+    erro, para não corromper as respostas.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    original_stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        for line in stdin:
+            if not line.strip():
+                continue
+            response = daemon.handle_line(line)
+            if response is not None:
+                stdout.write(response + "\n")
+                stdout.flush()
+            if daemon.stopped.is_set():
+                break
+    finally:
+        sys.stdout = original_stdout
+        daemon.close()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.submit(line.decode("utf-8"))
+                if response is not None:
+                    self.wfile.write(response.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+            finally:
+                self.server.answered()
+            if self.server.analysis_daemon.stopped.is_set():
+                break
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, analysis_daemon):
+        super().__init__(socket_path, _RequestHandler)
+        self.analysis_daemon = analysis_daemon
+        self.requests = queue.Queue()  # (linha, Future com a resposta)
+        self._closing = False
+        self._unanswered = 0  # respostas ainda não escritas nas conexões
+        self._state = threading.Condition()
+
+    def submit(self, line):
+        """
+        Entrega a linha à thread principal, que executa as requisições, e aguarda a resposta.
+
+        Depois de escrever a resposta, a conexão chama `answered`.
+        """
+        response = Future()
+        with self._state:
+            self._unanswered += 1
+            if self._closing:
+                return AnalysisDaemon.reject_line(line)
+            self.requests.put((line, response))
+        return response.result()
+
+    def answered(self):
+        with self._state:
+            self._unanswered -= 1
+            self._state.notify_all()
+
+    def reject_pending(self, timeout=_CLOSE_TIMEOUT_SECONDS):
+        """
+        Recusa, respondendo com erro, as requisições ainda na fila e as que chegarem
+        depois, e aguarda (até `timeout` segundos) que as respostas sejam escritas.
+        """
+        self.analysis_daemon.stopped.set()
+        with self._state:
+            self._closing = True
+        while True:
+            try:
+                line, response = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            response.set_result(AnalysisDaemon.reject_line(line))
+        with self._state:
+            self._state.wait_for(lambda: self._unanswered == 0, timeout)
+
+
+def serve_unix(daemon, socket_path):
+    """
+    Atende requisições em um socket Unix, uma por linha, com várias conexões simultâneas.
+
+    Cada conexão é atendida por uma thread, mas as requisições são executadas
+    pela thread principal, uma de cada vez: o engine do pylint não pode ser
+    usado por duas threads ao mesmo tempo, e os limites por arquivo (ver
+    `limits.enforce_limits`) dependem de sinais, que só a thread principal
+    recebe. Ao encerrar, as requisições que ainda aguardam na fila recebem
+    uma resposta de erro (`SHUTTING_DOWN`).
+    """
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = _UnixServer(socket_path, daemon)
+    listener = threading.Thread(target=server.serve_forever, name="scylla-socket", daemon=True)
+    listener.start()
+    print(f"Scylla {__version__} aguardando requisições em {socket_path}", file=sys.stderr)
+    try:
+        while not daemon.stopped.is_set():
+            try:
+                line, response = server.requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                response.set_result(daemon.handle_line(line))
+            except BaseException as error:
+                response.set_exception(error)
+                raise
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.reject_pending()
+        server.shutdown()
+        server.server_close()
+        os.remove(socket_path)
+        daemon.close()
@@ -0,0 +1,247 @@
+# evaluate.py
+
+import argparse
+import csv
+import os
+import sys
+from collections import Counter
+from typing import NamedTuple, Optional, Tuple
+
+from analyzer import analyze_files
+from result_cache import DEFAULT_CACHE_FILE
+from walker import iter_python_files
+
+EVALUATION_DIR = "evaluation"
+CORPORA_DIR = os.path.join(EVALUATION_DIR, "code fragments")
+DATASET_DIR = os.path.join(EVALUATION_DIR, "preproceeded dataset")
+DEFAULT_OUTPUT_DIR = os.path.join(EVALUATION_DIR, "regenerated")
+
+HEADERS = ["System", "Package", "Module", "Smell", "Line Ini", "Line Fin"]
+SYSTEM = "Scylla"
+
+# Checkers comparados com as outras ferramentas do dataset
+EVALUATED_CHECKERS = ("Long Method", "Too Many Arguments", "Large Class")
+
+# Nome, no dataset, de cada code smell (inclusive como gravado pelas versões antigas do Scylla)
+DATASET_SMELLS = {
+    "Long Method": "Long method",
+    "Too Many Arguments": "Long parameter list",
+    "Long parameter list": "Long parameter list",
+    "Large Class": "Large class",
+}
+
+
+class Corpus(NamedTuple):
+    """Diretório de `CORPORA_DIR` e o pacote que ele representa no dataset."""
+    directory: str
+    package: str
+
+
+class Evaluation(NamedTuple):
+    """
+    Arquivo do dataset gerado a partir de um ou mais corpora.
+
+    `legacy` é um CSV no formato de saída do Scylla (caminhos absolutos de
+    quem o gerou), usado como referência enquanto `file` não existir.
+    """
+    file: str
+    corpora: Tuple[Corpus, ...]
+    legacy: Optional[str] = None
+
+
+EVALUATIONS = (
+    Evaluation("result_scylla-dpy.csv", (
+        Corpus("dpy_django.django.contrib.admin", "django.django.contrib.admin"),
+        Corpus("dpy_django.django.db.models", "django.django.db.models"),
+    ), legacy="Scylla_dpy.csv"),
+    Evaluation("result_scylla-pysmell.csv", (
+        Corpus("pysmell_django.django.contrib.admin", "django.django.contrib.admin"),
+        Corpus("pysmell_django.django.db.models", "django.django.db.models"),
+    )),
+    Evaluation("result_scylla-flask.csv", (
+        Corpus("flask-teste", "flask"),
+    ), legacy="Scylla_flask.csv"),
+)
+
+
+def _row_key(row):
+    return row[1], row[2], row[3], int(row[4] or 0), int(row[5] or 0)
+
+
+def dataset_row(package, relative_path, start, end, smell):
+    """
+    Converte um code smell em uma linha do dataset.
+
+    Args:
+        package (str): Pacote do corpus.
+        relative_path (str): Caminho do arquivo relativo ao corpus, com `/`.
+        start (int): Linha inicial.
+        end (int): Linha final.
+        smell (str): Tipo do code smell, como gravado pelo Scylla.
+
+    Returns:
+        Optional[Tuple[str, ...]]: Linha do dataset, ou None se o code smell não
+            for comparado no dataset.
+    """
+    smell = DATASET_SMELLS.get(smell.split(":")[0].strip())
+    if smell is None:
+        return None
+    directory, file_name = os.path.split(relative_path)
+    if directory:
+        package = ".".join([package, *directory.split("/")])
+    return SYSTEM, package, os.path.splitext(file_name)[0], smell, str(start), str(end)
+
+
+def run_corpora(corpora, jobs=0, cache_file=DEFAULT_CACHE_FILE):
+    """
+    Executa o Scylla nos corpora, em paralelo e com cache.
+
+    Returns:
+        List[Tuple[str, ...]]: Linhas do dataset, ordenadas.
+    """
+    rows = []
+    for corpus in corpora:
+        root = os.path.join(CORPORA_DIR, corpus.directory)
+        results = analyze_files(iter_python_files(root), jobs=jobs, cache_file=cache_file,
+                                only=list(EVALUATED_CHECKERS))
+        for result in results:
+            relative_path = os.path.relpath(result.path, root).replace(os.sep, "/")
+            for smell in result.smells:
+                row = dataset_row(corpus.package, relative_path, smell.start, smell.end, smell.label)
+                if row is not None:
+                    rows.append(row)
+    return sorted(rows, key=_row_key)
+
+
+def read_dataset(path):
+    """Lê um arquivo do dataset, no formato de `HEADERS`."""
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        return [tuple(row) for row in reader if row]
+
+
+def read_legacy(path, corpora):
+    """
+    Lê um CSV no formato de saída do Scylla e o converte para o formato do dataset.
+
+    Os caminhos, gravados na máquina de quem gerou o arquivo (inclusive no
+    Windows), são associados ao arquivo do corpus cujo caminho relativo é o
+    maior sufixo deles.
+    """
+    files = {}
+    for corpus in corpora:
+        root = os.path.join(CORPORA_DIR, corpus.directory)
+        for file_path in iter_python_files(root):
+            files[os.path.relpath(file_path, root).replace(os.sep, "/")] = corpus
+
+    rows = []
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 4:
+                continue
+            path_in_row = "/" + row[0].replace("\\", "/")
+            matches = [relative for relative in files if path_in_row.endswith("/" + relative)]
+            if not matches:
+                continue
+            relative_path = max(matches, key=len)
+            converted = dataset_row(files[relative_path].package, relative_path, row[1], row[2], row[3])
+            if converted is not None:
+                rows.append(converted)
+    return sorted(rows, key=_row_key)
+
+
+def write_dataset(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, lineterminator="\n")
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+
+def diff_rows(reference, regenerated):
+    """
+    Compara duas listas de linhas do dataset, sem considerar a ordem.
+
+    Returns:
+        Tuple[List[Tuple], List[Tuple]]: Linhas que só existem na referência e
+            linhas que só existem no resultado regenerado, ordenadas.
+    """
+    reference_count = Counter(reference)
+    regenerated_count = Counter(regenerated)
+    removed = sorted((reference_count - regenerated_count).elements(), key=_row_key)
+    added = sorted((regenerated_count - reference_count).elements(), key=_row_key)
+    return removed, added
+
+
+def evaluate(evaluations=EVALUATIONS, jobs=0, cache_file=DEFAULT_CACHE_FILE, output_dir=DEFAULT_OUTPUT_DIR,
+             update=False, show=20):
+    """
+    Regenera os arquivos do dataset e os compara com os arquivos versionados.
+
+    Args:
+        evaluations (Iterable[Evaluation]): Arquivos do dataset a regenerar.
+        jobs (int): Quantidade de processos de análise. 0 usa todos os núcleos.
+        cache_file (str): Banco do cache de resultados. None desativa o cache.
+        output_dir (str): Diretório onde os arquivos regenerados são gravados.
+        update (bool): Substitui os arquivos do dataset pelos regenerados.
+        show (int): Quantidade máxima de diferenças mostradas por arquivo.
+
+    Returns:
+        bool: True se todos os arquivos regenerados forem iguais às referências.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    identical = True
+    for evaluation in evaluations:
+        rows = run_corpora(evaluation.corpora, jobs, cache_file)
+        write_dataset(os.path.join(output_dir, evaluation.file), rows)
+
+        reference_path = os.path.join(DATASET_DIR, evaluation.file)
+        if os.path.exists(reference_path):
+            reference = read_dataset(reference_path)
+        elif evaluation.legacy is not None:
+            reference_path = os.path.join(DATASET_DIR, evaluation.legacy)
+            reference = read_legacy(reference_path, evaluation.corpora)
+        else:
+            reference_path, reference = None, []
+
+        removed, added = diff_rows(reference, rows)
+        status = "igual" if not removed and not added else f"-{len(removed)} +{len(added)}"
+        print(f"{evaluation.file}: {len(rows)} linhas regeneradas, {len(reference)} na referência "
+              f"({os.path.basename(reference_path) if reference_path else 'inexistente'}): {status}")
+        for sign, diff in (("-", removed), ("+", added)):
+            for row in diff[:show]:
+                print(f"  {sign} {','.join(row[1:])}")
+            if len(diff) > show:
+                print(f"  {sign} ... mais {len(diff) - show} linha(s)")
+
+        identical = identical and not removed and not added
+        if update:
+            write_dataset(os.path.join(DATASET_DIR, evaluation.file), rows)
+    return identical
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Regenera os resultados do Scylla no dataset de avaliação e os compara com os versionados.")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="Quantidade de processos de análise (0, o padrão, usa todos os núcleos).")
+    parser.add_argument("--cache-file", default=DEFAULT_CACHE_FILE,
+                        help="Banco SQLite do cache de resultados.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Analisa todos os arquivos sem consultar nem atualizar o cache.")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help="Diretório onde os arquivos regenerados são gravados.")
+    parser.add_argument("--update", action="store_true",
+                        help=f"Substitui os arquivos de '{DATASET_DIR}' pelos regenerados.")
+    parser.add_argument("--show", type=int, default=20,
+                        help="Quantidade máxima de diferenças mostradas por arquivo.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    same = evaluate(jobs=args.jobs, cache_file=None if args.no_cache else args.cache_file,
+                    output_dir=args.output_dir, update=args.update, show=args.show)
+    sys.exit(0 if same or args.update else 1)
@@ -0,0 +1,110 @@
+# file_context.py
+
+import ast
+import hashlib
+import io
+import tokenize
+
+from ast_engine import run_visitors
+from line_index import LineIndex
+
+
+class FileContext:
+    """
+    Contexto de análise de um único arquivo Python.
+
+    O arquivo é lido e decodificado uma única vez; as linhas e a AST ficam
+    disponíveis para todos os checkers, que não precisam mais reabrir o arquivo.
+
+    Attributes:
+        path (str): Caminho do arquivo analisado.
+        source (str): Conteúdo decodificado do arquivo.
+        lines (List[str]): Linhas do arquivo, com as quebras de linha.
+        content_hash (str): SHA-256 do conteúdo bruto do arquivo, quando lido do disco.
+        size (int): Tamanho, em bytes, do conteúdo bruto do arquivo, quando lido do disco.
+    """
+
+    def __init__(self, path, source, content_hash=None, size=None):
+        self.path = path
+        self.source = source
+        self.content_hash = content_hash
+        self.size = size
+        self.lines = io.StringIO(source).readlines()
+        self._tree = None
+        self._tokens = None
+        self._line_index = None
+        self._visitors = {}
+
+    @classmethod
+    def from_path(cls, path):
+        """
+        Lê o arquivo em `path` respeitando a declaração de encoding (PEP 263).
+
+        Args:
+            path (str): Caminho do arquivo Python.
+
+        Returns:
+            FileContext: Contexto com o conteúdo já decodificado.
+        """
+        with open(path, "rb") as file:
+            raw = file.read()
+        try:
+            encoding, _ = tokenize.detect_encoding(io.BytesIO(raw).readline)
+        except SyntaxError:
+            encoding = "utf-8"
+        content_hash = hashlib.sha256(raw).hexdigest()
+        with io.TextIOWrapper(io.BytesIO(raw), encoding=encoding, errors="ignore") as text:
+            return cls(path, text.read(), content_hash, len(raw))
+
+    @property
+    def tree(self):
+        """AST do arquivo, gerada na primeira consulta e reaproveitada depois."""
+        if self._tree is None:
+            self._tree = ast.parse(self.source, filename=self.path)
+        return self._tree
+
+    @property
+    def tokens(self):
+        """Tokens do arquivo, gerados na primeira consulta e reaproveitados depois."""
+        if self._tokens is None:
+            self._tokens = list(tokenize.generate_tokens(io.StringIO(self.source).readline))
+        return self._tokens
+
+    @property
+    def line_index(self):
+        """Índice de linhas e blocos do arquivo (ver `LineIndex`)."""
+        if self._line_index is None:
+            try:
+                tokens = self.tokens
+            except (tokenize.TokenError, SyntaxError):
+                tokens = None
+            self._line_index = LineIndex(self.lines, tokens)
+        return self._line_index
+
+    def run_visitors(self, visitor_classes):
+        """
+        Executa, em uma única passagem pela AST, os visitors ainda não executados.
+
+        Args:
+            visitor_classes (Iterable[type]): Classes dos visitors (ex.: os dos
+                checkers selecionados, ver `checker_registry.checker_visitors`).
+        """
+        pending = [visitor_cls for visitor_cls in visitor_classes if visitor_cls not in self._visitors]
+        if pending:
+            self._visitors.update(run_visitors(self.tree, pending))
+
+    def visitor(self, visitor_cls):
+        """
+        Visitor estrutural já executado sobre a AST do arquivo.
+
+        Os visitors executados antes com `run_visitors` são reaproveitados; um
+        visitor ainda não executado passa pela AST sozinho.
+
+        Args:
+            visitor_cls (type): Classe do visitor desejado.
+
+        Returns:
+            StructuralVisitor: Instância do visitor após a passagem.
+        """
+        self.run_visitors([visitor_cls])
+        return self._visitors[visitor_cls]
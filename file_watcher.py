@@ -0,0 +1,236 @@
+# file_watcher.py
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from walker import DEFAULT_EXCLUDED_DIRS, iter_python_files
+
+# Constantes do inotify (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Tempo de espera por eventos relacionados (um salvamento costuma gerar vários)
+_SETTLE_SECONDS = 0.05
+
+
+def _stat(path):
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+    return status.st_mtime_ns, status.st_size
+
+
+class PollingWatcher:
+    """
+    Detecta alterações nos arquivos `.py` de um diretório por varredura periódica.
+
+    A cada intervalo o diretório é percorrido com `iter_python_files` e a data
+    de modificação e o tamanho de cada arquivo são comparados com os da
+    varredura anterior. Funciona em qualquer sistema; no Linux,
+    `create_watcher` prefere o `InotifyWatcher`.
+
+    Args:
+        root (str): Diretório observado.
+        exclude (List[str]): Padrões adicionais no formato do .gitignore.
+        use_gitignore (bool): Respeita os arquivos .gitignore encontrados.
+        interval (float): Intervalo entre varreduras, em segundos.
+    """
+
+    def __init__(self, root, exclude=(), use_gitignore=True, interval=0.5):
+        self.root = root
+        self.exclude = exclude
+        self.use_gitignore = use_gitignore
+        self.interval = interval
+        self._known = {}
+        self._rescan()
+        self._scanned = time.monotonic()
+
+    def files(self):
+        """Arquivos `.py` observados, na ordem da varredura."""
+        return list(self._known)
+
+    def _rescan(self):
+        """Percorre o diretório novamente e retorna os arquivos criados, alterados ou removidos."""
+        current = {}
+        for path in iter_python_files(self.root, exclude=self.exclude, use_gitignore=self.use_gitignore):
+            current[path] = _stat(path)
+        changed = {path for path, status in current.items() if self._known.get(path) != status}
+        changed.update(path for path in self._known if path not in current)
+        self._known = current
+        return changed
+
+    def wait(self):
+        """
+        Bloqueia até que algum arquivo `.py` seja criado, alterado ou removido.
+
+        Returns:
+            Set[str]: Caminhos alterados. Arquivos removidos não existem mais no disco.
+        """
+        while True:
+            time.sleep(self.interval)
+            changed = self._rescan()
+            if changed:
+                return changed
+
+    def changes(self):
+        """
+        Retorna, sem bloquear, os arquivos `.py` criados, alterados ou removidos
+        desde a chamada anterior (ou desde a criação do observador).
+
+        A varredura é refeita no máximo uma vez por intervalo; antes disso,
+        nenhuma alteração é informada.
+
+        Returns:
+            Set[str]: Caminhos alterados. Arquivos removidos não existem mais no disco.
+        """
+        if time.monotonic() - self._scanned < self.interval:
+            return set()
+        self._scanned = time.monotonic()
+        return self._rescan()
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(PollingWatcher):
+    """
+    Detecta alterações nos arquivos `.py` de um diretório com o inotify do Linux.
+
+    Cada diretório da árvore (exceto os de `DEFAULT_EXCLUDED_DIRS`) recebe
+    um watch. Salvar um arquivo já conhecido custa apenas um `stat` desse
+    arquivo; criações, remoções e renomeações de diretórios, ou um estouro da
+    fila de eventos do kernel, provocam uma nova varredura completa.
+
+    Raises:
+        OSError: Se o inotify não estiver disponível ou o limite de watches for atingido.
+    """
+
+    def __init__(self, root, exclude=(), use_gitignore=True):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc não encontrada.")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify não disponível.")
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou.")
+        self._directories = {}  # watch descriptor -> diretório
+        try:
+            self._watch_tree(root)
+        except OSError:
+            os.close(self._fd)
+            raise
+        super().__init__(root, exclude, use_gitignore)
+
+    def _watch_tree(self, top):
+        for directory, subdirs, _ in os.walk(top):
+            subdirs[:] = [name for name in subdirs if name not in DEFAULT_EXCLUDED_DIRS]
+            descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if descriptor < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch falhou para {directory}.")
+            self._directories[descriptor] = directory
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            yield descriptor, mask, name
+
+    def wait(self):
+        while True:
+            select.select([self._fd], [], [])
+            time.sleep(_SETTLE_SECONDS)
+            changed = self.changes()
+            if changed:
+                return changed
+
+    def changes(self):
+        """Lê os eventos já recebidos, sem bloquear; ver `PollingWatcher.changes`."""
+        paths = set()
+        rescan = False
+        while True:
+            events = list(self._read_events())
+            if not events:
+                break
+            for descriptor, mask, name in events:
+                directory = self._directories.get(descriptor)
+                if mask & _IN_IGNORED:
+                    # Diretório removido; o kernel já descartou o watch
+                    self._directories.pop(descriptor, None)
+                    continue
+                if mask & _IN_Q_OVERFLOW or directory is None:
+                    rescan = True
+                    continue
+                path = os.path.join(directory, name)
+                if mask & _IN_ISDIR or mask & _IN_DELETE_SELF:
+                    rescan = True
+                    if mask & (_IN_CREATE | _IN_MOVED_TO) and mask & _IN_ISDIR:
+                        self._watch_tree(path)
+                elif name.endswith(".py"):
+                    if path in self._known:
+                        paths.add(path)
+                    else:
+                        rescan = True
+
+        if rescan:
+            return self._rescan()
+        changed = set()
+        for path in paths:
+            status = _stat(path)
+            if status is None:
+                del self._known[path]
+                changed.add(path)
+            elif status != self._known[path]:
+                self._known[path] = status
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+def create_watcher(root, exclude=(), use_gitignore=True, polling=False):
+    """
+    Cria o observador de arquivos mais eficiente disponível.
+
+    Args:
+        root (str): Diretório observado.
+        exclude (List[str]): Padrões adicionais no formato do .gitignore.
+        use_gitignore (bool): Respeita os arquivos .gitignore encontrados.
+        polling (bool): Força a varredura periódica, mesmo com inotify disponível
+            (útil em sistemas de arquivos de rede).
+
+    Returns:
+        PollingWatcher: `InotifyWatcher` no Linux; caso contrário, `PollingWatcher`.
+    """
+    if not polling and os.path.isdir(root):
+        try:
+            return InotifyWatcher(root, exclude, use_gitignore)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, exclude, use_gitignore)
@@ -0,0 +1,102 @@
+# git_changes.py
+
+import bisect
+import os
+import re
+import subprocess
+
+_DIFF_OPTIONS = ["--no-color", "--no-ext-diff", "--relative", "--diff-filter=ACMR"]
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def changed_hunks(directory, base):
+    """
+    Lista os arquivos `.py` alterados em relação a uma revisão e os trechos alterados.
+
+    Compara `base` com a árvore de trabalho (incluindo alterações ainda não
+    commitadas) usando o git local. Arquivos novos ainda não adicionados ao
+    git (e não ignorados) contam como alterados por inteiro. Arquivos
+    removidos são ignorados.
+
+    Args:
+        directory (str): Diretório analisado, dentro de um repositório git.
+        base (str): Revisão de referência (ex.: `origin/main`).
+
+    Returns:
+        Dict[str, List[Tuple[int, int]]]: Para cada arquivo alterado, os intervalos
+            (linha inicial, linha final) alterados, em ordem. Remoções puras são
+            representadas pela linha que antecede o trecho removido.
+
+    Raises:
+        RuntimeError: Se o git não conseguir calcular a diferença.
+    """
+    # Os nomes vêm de `--name-only -z`, sem aspas nem escapes, na mesma ordem das
+    # seções "diff --git" do patch (o cabeçalho "+++ b/arquivo" ganha aspas ou um
+    # tab no final conforme os caracteres do nome)
+    names = _git_paths(directory, "diff", *_DIFF_OPTIONS, "--name-only", "-z", base, "--", "*.py")
+    patch = _git(directory, "diff", *_DIFF_OPTIONS, "--unified=0", base, "--", "*.py")
+
+    hunks = {}
+    current = None
+    sections = iter(names)
+    for line in patch.splitlines():
+        if line.startswith("diff --git "):
+            current = next(sections)
+            continue
+        hunk = _HUNK_HEADER.match(line)
+        if hunk and current is not None:
+            # Renomeações e mudanças de modo sem trechos alterados não entram
+            ranges = hunks.setdefault(current, [])
+            start = int(hunk.group(1))
+            length = int(hunk.group(2)) if hunk.group(2) is not None else 1
+            if length == 0:
+                ranges.append((max(start, 1), max(start, 1)))
+            else:
+                ranges.append((start, start + length - 1))
+
+    # Arquivos `.py` que o git não rastreia nem ignora
+    for path in _git_paths(directory, "ls-files", "--others", "--exclude-standard", "-z", "--", "*.py"):
+        hunks[path] = [(1, max(_count_lines(path), 1))]
+
+    return {path: ranges for path, ranges in sorted(hunks.items())}
+
+
+def _git(directory, command, *args):
+    result = subprocess.run(
+        ["git", "-C", directory, command, *args],
+        text=True,
+        capture_output=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git {command} falhou: {result.stderr.strip()}")
+    return result.stdout
+
+
+def _git_paths(directory, command, *args):
+    """Caminhos listados por um comando git com `-z`, relativos ao diretório atual."""
+    output = _git(directory, command, *args)
+    return [os.path.normpath(os.path.join(directory, name)) for name in output.split("\0") if name]
+
+
+def _count_lines(path):
+    with open(path, "rb") as file:
+        return sum(1 for _ in file)
+
+
+def overlaps_hunks(start, end, ranges):
+    """
+    Indica se o intervalo de linhas [start, end] toca algum trecho alterado.
+
+    Args:
+        start (int): Linha inicial do code smell.
+        end (int): Linha final do code smell.
+        ranges (List[Tuple[int, int]]): Trechos alterados, ordenados e sem sobreposição.
+    """
+    # Primeiro trecho cujo fim não está antes de `start`
+    index = bisect.bisect_left(ranges, start, key=lambda hunk: hunk[1])
+    return index < len(ranges) and ranges[index][0] <= end
+
+
+def filter_changed_lines(smells, ranges):
+    """Mantém apenas os code smells cujo intervalo de linhas toca um trecho alterado."""
+    return [smell for smell in smells if overlaps_hunks(smell.start, smell.end, ranges)]
@@ -0,0 +1,97 @@
+# limits.py
+
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+# Intervalo entre as verificações dos limites
+CHECK_INTERVAL = 0.05
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class FileLimits(NamedTuple):
+    """Limites de cada etapa (pylint e checkers) da análise de um arquivo."""
+    timeout: Optional[float] = None  # tempo máximo, em segundos
+    memory: Optional[int] = None  # memória máxima, em MB
+
+
+class FileLimitExceeded(BaseException):
+    """
+    Um arquivo excedeu um dos limites de `FileLimits`.
+
+    Deriva de `BaseException` para atravessar os `except Exception` do pylint
+    e do astroid, que de outro modo transformariam a interrupção em uma
+    mensagem comum.
+
+    Args:
+        reason (str): Limite excedido e etapa em que isso ocorreu.
+    """
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def resident_memory(pid="self"):
+    """Memória residente de um processo, em bytes, ou None se não puder ser medida."""
+    try:
+        with open(f"/proc/{pid}/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _can_interrupt():
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def enforce_limits(limits, step):
+    """
+    Interrompe o bloco com `FileLimitExceeded` se ele exceder os limites.
+
+    Um timer (`SIGALRM`) verifica periodicamente o tempo decorrido e o
+    crescimento da memória residente desde a entrada no bloco. Código em C
+    (como `ast.parse`) só é interrompido quando devolve o controle ao
+    interpretador. Os limites não são aplicados fora da thread principal
+    nem em sistemas sem `setitimer`; a memória só é medida no Linux.
+
+    Args:
+        limits (FileLimits): Limites a aplicar. None não aplica nenhum.
+        step (str): Nome da etapa, usado no motivo da interrupção.
+
+    Raises:
+        FileLimitExceeded: Se um limite for excedido ou a memória se esgotar.
+    """
+    if limits is None or (limits.timeout is None and limits.memory is None) or not _can_interrupt():
+        yield
+        return
+
+    started = time.monotonic()
+    baseline = resident_memory() if limits.memory is not None else None
+    active = True
+
+    def check(signum, frame):
+        if not active:
+            return
+        if limits.timeout is not None and time.monotonic() - started > limits.timeout:
+            raise FileLimitExceeded(f"{step}: tempo limite de {limits.timeout:g}s excedido")
+        if baseline is not None:
+            used = resident_memory()
+            if used is not None and used - baseline > limits.memory * 2 ** 20:
+                raise FileLimitExceeded(f"{step}: limite de memória de {limits.memory} MB excedido")
+
+    previous = signal.signal(signal.SIGALRM, check)
+    signal.setitimer(signal.ITIMER_REAL, CHECK_INTERVAL, CHECK_INTERVAL)
+    try:
+        yield
+    except MemoryError as error:
+        raise FileLimitExceeded(f"{step}: memória esgotada") from error
+    finally:
+        active = False
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -0,0 +1,113 @@
+# line_index.py
+
+import tokenize
+from array import array
+
+# Classificação de cada linha
+CODE = 0
+BLANK = 1
+COMMENT = 2
+CONTINUATION = 3  # continuação de uma linha lógica (string multilinha, parênteses abertos)
+
+
+class LineIndex:
+    """
+    Índice das linhas de um arquivo, construído uma única vez.
+
+    Guarda, em arrays compactos, a indentação e a classificação de cada linha
+    e, para cada linha que inicia uma linha lógica, onde termina o bloco que
+    ela abre. Assim, "onde termina o bloco que começa na linha N?" é uma
+    consulta O(1) para qualquer checker baseado em intervalos.
+
+    Um bloco termina na primeira linha lógica seguinte com indentação menor ou
+    igual à da linha inicial. Linhas vazias, comentários e continuações (por
+    exemplo, o conteúdo de docstrings) nunca encerram um bloco.
+
+    Todas as linhas são numeradas a partir de 0.
+
+    Args:
+        lines (List[str]): Linhas do arquivo.
+        tokens (List[tokenize.TokenInfo]): Tokens do arquivo, usados para
+            reconhecer continuações. Se None, toda linha não vazia e que não é
+            comentário é considerada início de linha lógica.
+    """
+
+    def __init__(self, lines, tokens=None):
+        total = len(lines)
+        self.indent = array("I", bytes(4 * total))
+        self.kind = bytearray(total)
+
+        for i, line in enumerate(lines):
+            stripped = line.lstrip()
+            self.indent[i] = len(line) - len(stripped)
+            if not stripped.strip():
+                self.kind[i] = BLANK
+            elif stripped.startswith("#"):
+                self.kind[i] = COMMENT
+
+        if tokens is not None:
+            starts = _logical_line_starts(tokens)
+            for i in range(total):
+                if self.kind[i] == CODE and i not in starts:
+                    self.kind[i] = CONTINUATION
+
+        # Próxima linha lógica com indentação menor ou igual, para cada início de linha lógica
+        self._terminator = array("I", [total]) * total
+        stack = []
+        for i in range(total - 1, -1, -1):
+            if self.kind[i] != CODE:
+                continue
+            while stack and self.indent[stack[-1]] > self.indent[i]:
+                stack.pop()
+            if stack:
+                self._terminator[i] = stack[-1]
+            stack.append(i)
+
+        # Última linha de código (início ou continuação) até cada posição
+        self._last_code = array("i", bytes(4 * total))
+        last = -1
+        for i in range(total):
+            if self.kind[i] in (CODE, CONTINUATION):
+                last = i
+            self._last_code[i] = last
+
+    def __len__(self):
+        return len(self.kind)
+
+    def _check(self, line):
+        if not 0 <= line < len(self.kind):
+            raise ValueError("A linha de início está fora do índice do código fornecido.")
+
+    def block_terminator(self, line):
+        """Índice da linha que encerra o bloco iniciado em `line` (ou o total de linhas)."""
+        self._check(line)
+        if self.kind[line] == CODE:
+            return self._terminator[line]
+        for i in range(line + 1, len(self.kind)):
+            if self.kind[i] == CODE and self.indent[i] <= self.indent[line]:
+                return i
+        return len(self.kind)
+
+    def block_length(self, line):
+        """Quantidade de linhas do bloco iniciado em `line`, incluindo linhas vazias ao final."""
+        return self.block_terminator(line) - line
+
+    def block_end(self, line):
+        """Índice da última linha de código do bloco iniciado em `line`."""
+        return max(self._last_code[self.block_terminator(line) - 1], line)
+
+
+def _logical_line_starts(tokens):
+    """Conjunto de índices (a partir de 0) das linhas que iniciam uma linha lógica."""
+    starts = set()
+    at_start = True
+    for token in tokens:
+        if token.type == tokenize.NEWLINE:
+            at_start = True
+        elif token.type in (tokenize.NL, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT,
+                            tokenize.ENCODING, tokenize.ENDMARKER):
+            continue
+        elif at_start:
+            starts.add(token.start[0] - 1)
+            at_start = False
+    return starts
@@ -1,87 +1,323 @@
-import csv
-import glob
-from pylint_utils import run_pylint
-from code_smell_checkers import (
-    check_too_many_arguments,
-    check_long_method,
-    check_dead_code,
-    check_lc,
-    detect_lazy_classes,
-    detect_parallel_inheritance,
-    check_magic_numbers
-)
-
-
-def save_results_to_csv(results, output_file="code_smells.csv"):
+import argparse
+import os
+import time
+from contextlib import nullcontext
+from itertools import groupby
+from analyzer import analyze_files, forget_files, project_findings, project_setup
+from checker_registry import select_checkers, smell_names
+from daemon import AnalysisDaemon, serve_stdio, serve_unix
+from file_watcher import create_watcher
+from git_changes import changed_hunks, filter_changed_lines
+from limits import FileLimits
+from memory_profile import MemoryProfiler
+from metrics import MetricsRecorder
+from project_index import ProjectIndex
+from result_cache import DEFAULT_CACHE_FILE
+from result_sink import CsvResultSink
+from walker import iter_python_files
+
+
+def _write_project_findings(sink, project_index, project_smells):
+    """Grava os code smells do projeto inteiro, agrupados por arquivo."""
+    for _, smells in groupby(project_findings(project_index, project_smells), key=lambda smell: smell.path_id):
+        sink.write(list(smells))
+
+
+def _untimed(*_):
+    """Substitui `MetricsRecorder.timed` quando as métricas não são registradas."""
+    return nullcontext()
+
+
+def check_code_smells_in_directory(directory, output_file="code_smells.csv", pylint_in_process=True, jobs=1,
+                                   exclude=(), use_gitignore=True, cache_file=DEFAULT_CACHE_FILE,
+                                   changed_since=None, changed_lines_only=False, only=None, skip=None,
+                                   checker_options=None, project_dead_code=False, project_hierarchy=False,
+                                   limits=None, metrics=None, memory_profile=None):
     """
-    Salva os resultados de code smells em um arquivo CSV.
+    Executa as verificações de code smells em todos os arquivos .py do diretório,
+    recursivamente, e salva os resultados em um arquivo CSV.
+
+    Os resultados são gravados à medida que cada arquivo é analisado. Saídas
+    terminadas em `.gz` são comprimidas com gzip.
 
     Args:
-        results (list): Lista de dicionários contendo os resultados das análises.
+        directory (str): Caminho para o diretório com arquivos Python.
         output_file (str): Nome do arquivo CSV de saída.
+        pylint_in_process (bool): Executa o pylint no próprio processo, reaproveitando
+            um único linter. Se False, executa o pylint em subprocessos, com vários
+            arquivos por invocação.
+        jobs (int): Quantidade de processos usados na análise. 0 usa todos os núcleos.
+        exclude (List[str]): Padrões, no formato do .gitignore, de caminhos a ignorar.
+        use_gitignore (bool): Ignora os caminhos listados nos arquivos .gitignore.
+        cache_file (str): Banco do cache de resultados. Arquivos cujo conteúdo não
+            mudou desde a última análise são lidos do cache. None desativa o cache.
+        changed_since (str): Revisão git de referência. Quando informada, só os
+            arquivos .py alterados desde ela são analisados.
+        changed_lines_only (bool): Com `changed_since`, mantém apenas os code smells
+            cujo intervalo de linhas toca um trecho alterado.
+        only (List[str]): Code smells a detectar. None detecta todos.
+        skip (List[str]): Code smells a não detectar. O pylint só é executado se
+            algum code smell selecionado depender dele.
+        checker_options (Dict[str, dict]): Argumentos extras por code smell
+            (ex.: `{"Long Method": {"logical": True}}`).
+        project_dead_code (bool): Procura funções e classes não utilizadas no projeto
+            inteiro, considerando importações e chamadas entre módulos, em vez de
+            olhar cada arquivo isoladamente. Esses resultados são gravados ao final.
+        project_hierarchy (bool): Verifica Lazy Class e Parallel Inheritance Hierarchies
+            na hierarquia de classes do projeto inteiro, resolvendo as bases pelas
+            importações entre módulos. Esses resultados são gravados ao final.
+        limits (FileLimits): Limites de tempo e de memória do pylint e dos checkers
+            em cada arquivo. Arquivos que os excedem são ignorados, com o motivo
+            informado ao final, e a análise dos demais continua.
+        metrics (MetricsRecorder): Se informado, recebe a duração de cada etapa
+            (leitura, parse, pylint, checkers, gravação) e de cada checker.
+        memory_profile (MemoryProfiler): Se informado, recebe a memória retida e o
+            pico de cada etapa de cada arquivo, e os locais de alocação que mais
+            retiveram memória na análise dos arquivos e nos code smells do projeto.
     """
-    if not results:
-        print("Nenhum resultado para salvar.")
-        return
+    # Valida a seleção antes de iniciar a varredura
+    project_smells, checker_options, project_index = project_setup(
+        directory, only, skip, checker_options, project_dead_code, project_hierarchy)
+
+    py_files = iter_python_files(directory, exclude=exclude, use_gitignore=use_gitignore)
+
+    hunks = None
+    if changed_since is not None:
+        hunks = changed_hunks(directory, changed_since)
+        py_files = (path for path in py_files if os.path.normpath(path) in hunks)
+
+    # Grava os resultados de cada arquivo assim que sua análise termina
+    with CsvResultSink(output_file) as sink:
+        results = analyze_files(py_files, jobs=jobs, pylint_in_process=pylint_in_process,
+                                cache_file=cache_file, only=only, skip=skip, options=checker_options,
+                                summaries=project_index is not None, limits=limits,
+                                metrics=metrics is not None or memory_profile is not None,
+                                profile_memory=memory_profile is not None)
+        timed = metrics.timed if metrics is not None else _untimed
+        skipped = []
+        for result in results:
+            if metrics is not None:
+                metrics.add_file(result)
+            if memory_profile is not None:
+                memory_profile.add_file(result)
+            if result.skipped:
+                skipped.append(result)
+                continue
+            smells = result.smells
+            if hunks is not None and changed_lines_only:
+                smells = filter_changed_lines(smells, hunks[os.path.normpath(result.path)])
+            with timed("write", len(smells)):
+                sink.write(smells)
+            if project_index is not None:
+                project_index.add(result.path, result.summary)
+
+        if memory_profile is not None:
+            memory_profile.snapshot("analysis")
+
+        # Os code smells do projeto só são conhecidos depois de todos os arquivos
+        if project_index is not None:
+            with timed("project"):
+                _write_project_findings(sink, project_index, project_smells)
+            if memory_profile is not None:
+                memory_profile.snapshot("project")
 
-    headers = [
-        "arquivo",
-        "linha inicial",
-        "linha final",
-        "code smells",
-        "descrição"
-    ]
+    if sink.rows_written:
+        print(f"Resultados salvos no arquivo {output_file}")
+    else:
+        print("Nenhum code smell encontrado.")
+    _report_skipped(skipped)
 
-    with open(output_file, mode="w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(results)
 
-    print(f"Resultados salvos no arquivo {output_file}")
+def _report_skipped(results):
+    """Informa os arquivos ignorados por excederem os limites de tempo ou de memória."""
+    if results:
+        print(f"{len(results)} arquivo(s) ignorado(s) por exceder os limites:")
+        for result in results:
+            print(f"  {result.path}: {result.skipped}")
 
 
-def check_code_smells_in_directory(directory, output_file="code_smells.csv"):
+def watch_directory(directory, output_file="code_smells.csv", pylint_in_process=True, jobs=1, exclude=(),
+                    use_gitignore=True, cache_file=DEFAULT_CACHE_FILE, only=None, skip=None, checker_options=None,
+                    project_dead_code=False, project_hierarchy=False, limits=None, polling=False):
     """
-    Executa as verificações de code smells em todos os arquivos .py do diretório
-    e salva os resultados em um arquivo CSV.
+    Analisa o diretório e, a cada arquivo .py salvo, criado ou removido, reanalisa
+    apenas os arquivos alterados e regrava o arquivo de saída.
+
+    Os resultados de todos os arquivos, os resumos de símbolos do projeto e o
+    engine do pylint permanecem em memória entre as alterações. A primeira
+    análise usa `jobs` processos; as seguintes rodam no próprio processo, com
+    o pylint já carregado. Executa até ser interrompido (Ctrl+C).
+
+    Os argumentos são os mesmos de `check_code_smells_in_directory`, além de:
 
     Args:
-        directory (str): Caminho para o diretório com arquivos Python.
-        output_file (str): Nome do arquivo CSV de saída.
+        polling (bool): Detecta alterações por varredura periódica em vez do inotify.
     """
-    py_files = glob.glob(f"{directory}/*.py")
-    all_results = []
-
-    for file_path in py_files:
-        pylint_output = run_pylint(file_path)
-
-        # Verifica cada tipo de code smell
-        TMA = check_too_many_arguments(file_path, pylint_output)
-        LM = check_long_method(file_path)
-        DC = check_dead_code(file_path, pylint_output)
-        LC = check_lc(file_path, pylint_output)
-        LZ = detect_lazy_classes(file_path)
-        PH = detect_parallel_inheritance(file_path)
-        MN = check_magic_numbers(file_path) 
-
-        # Coleta os resultados de cada análise
-        for smell in TMA + LM + DC + LC  + LZ + PH + MN:
-            if len(smell) == 5:
-                all_results.append({
-                    "arquivo": smell[0].replace("\\", "/"),
-                    "linha inicial": smell[1],
-                    "linha final": smell[2],
-                    "code smells": smell[3],
-                    "descrição": smell[4]
-                })
-            else:
-                print(f"A tupla retornada não tem 5 elementos: {smell}")
-
-    save_results_to_csv(all_results, output_file)
-
-
-# Exemplo de uso
+    project_smells, checker_options, project_index = project_setup(
+        directory, only, skip, checker_options, project_dead_code, project_hierarchy)
+    analysis = dict(pylint_in_process=pylint_in_process, cache_file=cache_file, only=only, skip=skip,
+                    options=checker_options, summaries=project_index is not None, limits=limits)
+
+    def write_output(results):
+        with CsvResultSink(output_file) as sink:
+            for result in results.values():
+                sink.write(result.smells)
+            if project_index is not None:
+                # O índice é refeito a partir dos resumos em memória, sem reler arquivos
+                index = ProjectIndex(project_index.root)
+                for result in results.values():
+                    if result.summary is not None:
+                        index.add(result.path, result.summary)
+                _write_project_findings(sink, index, project_smells)
+        return sink.rows_written
+
+    watcher = create_watcher(directory, exclude=exclude, use_gitignore=use_gitignore, polling=polling)
+    try:
+        started = time.perf_counter()
+        results = {result.path: result for result in analyze_files(watcher.files(), jobs=jobs, **analysis)}
+        _report_skipped([result for result in results.values() if result.skipped])
+        rows = write_output(results)
+        print(f"{len(results)} arquivo(s) analisado(s) em {time.perf_counter() - started:.2f}s; "
+              f"{rows} code smell(s) em {output_file}. Aguardando alterações...")
+
+        while True:
+            changed = watcher.wait()
+            started = time.perf_counter()
+            forget_files(changed)
+            for path in sorted(changed):
+                if not os.path.isfile(path):
+                    continue
+                try:
+                    for result in analyze_files([path], **analysis):
+                        results[result.path] = result
+                        _report_skipped([result] if result.skipped else [])
+                except SyntaxError as error:
+                    # Comum durante a edição: mantém os resultados anteriores do arquivo
+                    print(f"Erro de sintaxe em {path}, linha {error.lineno}; resultados anteriores mantidos.")
+            # Mantém a ordem da varredura e descarta os arquivos removidos
+            results = {path: results[path] for path in watcher.files() if path in results}
+            rows = write_output(results)
+            print(f"{len(changed)} arquivo(s) reanalisado(s) em {time.perf_counter() - started:.2f}s; "
+                  f"{rows} code smell(s) em {output_file}.")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def _smell_list(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scylla: detecção de code smells em Python.")
+    parser.add_argument("directory", help="Diretório (analisado recursivamente) ou arquivo Python.")
+    parser.add_argument("-o", "--output", default="code_smells.csv",
+                        help="Arquivo CSV de saída (.csv.gz para saída comprimida).")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Quantidade de processos de análise (0 usa todos os núcleos).")
+    parser.add_argument("-e", "--exclude", action="append", default=[], metavar="PATTERN",
+                        help="Padrão de caminhos a ignorar, no formato do .gitignore (pode ser repetido).")
+    parser.add_argument("--no-gitignore", action="store_true",
+                        help="Não respeita os arquivos .gitignore encontrados.")
+    parser.add_argument("--cache-file", default=DEFAULT_CACHE_FILE,
+                        help="Banco SQLite do cache de resultados.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Analisa todos os arquivos sem consultar nem atualizar o cache.")
+    parser.add_argument("--changed-since", metavar="REV",
+                        help="Analisa apenas os arquivos alterados desde a revisão git REV.")
+    parser.add_argument("--changed-lines-only", action="store_true",
+                        help="Com --changed-since, reporta apenas code smells que tocam linhas alteradas.")
+    parser.add_argument("--only", type=_smell_list, metavar="SMELLS",
+                        help="Detecta apenas os code smells informados, separados por vírgula. "
+                             f"Opções: {', '.join(smell_names())}.")
+    parser.add_argument("--skip", type=_smell_list, metavar="SMELLS",
+                        help="Não detecta os code smells informados, separados por vírgula.")
+    parser.add_argument("--long-method-logical", action="store_true",
+                        help="Mede Long Method em linhas lógicas (sem linhas vazias, comentários e docstrings).")
+    parser.add_argument("--project-dead-code", action="store_true",
+                        help="Detecta funções e classes não utilizadas considerando o projeto inteiro.")
+    parser.add_argument("--project-hierarchy", action="store_true",
+                        help="Verifica Lazy Class e Parallel Inheritance Hierarchies na hierarquia "
+                             "de classes do projeto inteiro.")
+    parser.add_argument("--file-timeout", type=float, metavar="SECONDS",
+                        help="Tempo máximo do pylint e dos checkers em cada arquivo; "
+                             "arquivos que o excedem são ignorados.")
+    parser.add_argument("--file-memory", type=int, metavar="MB",
+                        help="Memória máxima do pylint e dos checkers em cada arquivo; "
+                             "arquivos que a excedem são ignorados.")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Grava em FILE (JSON) a duração de cada etapa e de cada checker, com percentis.")
+    parser.add_argument("--metrics-prometheus", metavar="FILE",
+                        help="Grava as mesmas métricas de --metrics em FILE, no formato de texto do Prometheus.")
+    parser.add_argument("--profile-memory", nargs="?", const="memory_profile.json", metavar="FILE",
+                        help="Mede a memória de cada etapa com o tracemalloc e grava o perfil em FILE "
+                             "(padrão: memory_profile.json). A análise fica bem mais lenta.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Continua em execução e reanalisa os arquivos a cada alteração.")
+    parser.add_argument("--watch-polling", action="store_true",
+                        help="Com --watch, detecta alterações por varredura periódica em vez do inotify.")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Mantém o estado da análise em memória e atende requisições JSON-RPC "
+                             "(uma por linha) na entrada padrão ou no socket de --socket.")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="Com --daemon, atende requisições no socket Unix PATH.")
+    parser.add_argument("--pylint-subprocess", action="store_true",
+                        help="Executa o pylint em subprocessos em vez de no próprio processo.")
+    args = parser.parse_args(argv)
+    try:
+        select_checkers(args.only, args.skip)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.watch and args.changed_since:
+        parser.error("--watch não pode ser combinado com --changed-since.")
+    if args.daemon and (args.watch or args.changed_since):
+        parser.error("--daemon não pode ser combinado com --watch nem com --changed-since.")
+    if (args.metrics or args.metrics_prometheus or args.profile_memory) and (args.watch or args.daemon):
+        parser.error("--metrics, --metrics-prometheus e --profile-memory não podem ser combinados com --watch "
+                     "nem com --daemon.")
+    for flag in ("project_dead_code", "project_hierarchy"):
+        if getattr(args, flag) and args.changed_since:
+            parser.error(f"--{flag.replace('_', '-')} precisa analisar o projeto inteiro e não pode ser "
+                         "combinado com --changed-since.")
+    return args
+
+
 if __name__ == "__main__":
-    directory_path = "C:\\Users\\Gabriel\\Documents\\vscode\\testaCode\\arquivos"
-    output_csv = "code_smells.csv"
-    check_code_smells_in_directory(directory_path, output_csv)
+    args = parse_args()
+    options = dict(
+        pylint_in_process=not args.pylint_subprocess,
+        jobs=args.jobs,
+        exclude=args.exclude,
+        use_gitignore=not args.no_gitignore,
+        cache_file=None if args.no_cache else args.cache_file,
+        only=args.only,
+        skip=args.skip,
+        checker_options={"Long Method": {"logical": True}} if args.long_method_logical else None,
+        project_dead_code=args.project_dead_code,
+        project_hierarchy=args.project_hierarchy,
+        limits=FileLimits(args.file_timeout, args.file_memory),
+    )
+    if args.daemon:
+        del options["jobs"]
+        daemon = AnalysisDaemon(args.directory, **options)
+        if args.socket:
+            serve_unix(daemon, args.socket)
+        else:
+            serve_stdio(daemon)
+    elif args.watch:
+        watch_directory(args.directory, args.output, polling=args.watch_polling, **options)
+    else:
+        metrics = MetricsRecorder() if args.metrics or args.metrics_prometheus else None
+        memory_profile = MemoryProfiler() if args.profile_memory else None
+        check_code_smells_in_directory(args.directory, args.output, changed_since=args.changed_since,
+                                       changed_lines_only=args.changed_lines_only, metrics=metrics,
+                                       memory_profile=memory_profile, **options)
+        if args.metrics:
+            metrics.write_json(args.metrics)
+        if args.metrics_prometheus:
+            metrics.write_prometheus(args.metrics_prometheus)
+        if memory_profile is not None:
+            memory_profile.print_summary()
+            memory_profile.write_json(args.profile_memory)
+            print(f"Perfil de memória salvo no arquivo {args.profile_memory}")
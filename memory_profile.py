@@ -0,0 +1,141 @@
+# memory_profile.py
+
+import json
+import statistics
+import tracemalloc
+
+# Quantidade de locais de alocação e de arquivos listados no relatório
+TOP_SITES = 10
+TOP_FILES = 10
+
+# Um arquivo é um pico quando seu pico de memória supera este múltiplo da mediana
+SPIKE_FACTOR = 4.0
+
+# Alocações do próprio tracemalloc e do carregamento de módulos não interessam ao relatório
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _mib(size):
+    return round(size / 2 ** 20, 3)
+
+
+class MemoryProfiler:
+    """
+    Perfil de memória de uma análise, com o tracemalloc.
+
+    Cada etapa da análise de cada arquivo (leitura, parse, pylint, checkers,
+    resumo de símbolos) registra a memória que retém e o seu pico, medidos
+    onde ocorrem, inclusive nos processos de análise (ver `metrics.measure`).
+    Em volta das etapas de `check_code_smells_in_directory` (análise dos
+    arquivos, code smells do projeto) são tirados snapshots do processo
+    principal; a diferença entre eles indica os locais de alocação que mais
+    retiveram memória em cada etapa.
+
+    Os snapshots custam caro em heaps grandes (alguns segundos com milhões de
+    blocos), por isso não são tirados a cada arquivo.
+
+    Args:
+        frames (int): Quantidade de frames guardados por alocação.
+    """
+
+    def __init__(self, frames=1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.files = []  # (caminho, pico, memória retida, {etapa: (retida, pico)})
+        self.stages = []  # (etapa, memória ao final, locais de alocação)
+        self._previous = self._snapshot()
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def snapshot(self, stage):
+        """Registra as alocações retidas desde o snapshot anterior como as da etapa `stage`."""
+        current = self._snapshot()
+        differences = current.compare_to(self._previous, "lineno")
+        # O total vem do snapshot filtrado: o próprio snapshot anterior também ocupa memória rastreada
+        traced = sum(statistic.size for statistic in differences)
+        sites = []
+        growth = sorted((statistic for statistic in differences if statistic.size_diff > 0),
+                        key=lambda statistic: -statistic.size_diff)
+        for statistic in growth[:TOP_SITES]:
+            frame = statistic.traceback[0]
+            sites.append({
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_diff_mib": _mib(statistic.size_diff),
+                "count_diff": statistic.count_diff,
+                "size_mib": _mib(statistic.size),
+            })
+        self.stages.append((stage, traced, sites))
+        self._previous = current
+
+    def add_file(self, result):
+        """Registra a memória de um `FileResult` analisado com `metrics=True`."""
+        memory = (result.metrics or {}).get("memory")
+        if not memory:
+            return
+        peak = max(stage_peak for _, stage_peak in memory.values())
+        retained = sum(stage_retained for stage_retained, _ in memory.values())
+        self.files.append((result.path, peak, retained, memory))
+
+    def spikes(self):
+        """Arquivos cujo pico de memória supera `SPIKE_FACTOR` vezes a mediana, do maior para o menor."""
+        if not self.files:
+            return []
+        threshold = statistics.median(peak for _, peak, _, _ in self.files) * SPIKE_FACTOR
+        return sorted((entry for entry in self.files if entry[1] > threshold), key=lambda entry: -entry[1])
+
+    def report(self):
+        """
+        Returns:
+            dict: Perfil de memória, pronto para ser gravado em JSON.
+        """
+        def file_entry(entry):
+            path, peak, retained, memory = entry
+            return {
+                "path": path,
+                "peak_mib": _mib(peak),
+                "retained_mib": _mib(retained),
+                "stages": {stage: {"retained_mib": _mib(stage_retained), "peak_mib": _mib(stage_peak)}
+                           for stage, (stage_retained, stage_peak) in memory.items()},
+            }
+
+        file_stages = {}
+        for _, _, _, memory in self.files:
+            for stage, (stage_retained, stage_peak) in memory.items():
+                total = file_stages.setdefault(stage, {"retained": 0, "peak": 0})
+                total["retained"] += stage_retained
+                total["peak"] = max(total["peak"], stage_peak)
+
+        return {
+            "stages": [{"stage": stage, "traced_mib": _mib(traced), "top_sites": sites}
+                       for stage, traced, sites in self.stages],
+            "file_stages": {stage: {"retained_mib": _mib(total["retained"]), "max_peak_mib": _mib(total["peak"])}
+                            for stage, total in file_stages.items()},
+            "largest_peaks": [file_entry(entry)
+                              for entry in sorted(self.files, key=lambda entry: -entry[1])[:TOP_FILES]],
+            "spikes": [entry[0] for entry in self.spikes()],
+            "files": [file_entry(entry) for entry in self.files],
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2, ensure_ascii=False)
+
+    def print_summary(self):
+        """Mostra os locais de alocação de cada etapa e os arquivos com os maiores picos."""
+        for stage, traced, sites in self.stages:
+            print(f"Memória após a etapa {stage}: {_mib(traced)} MiB. Maiores alocações retidas:")
+            for site in sites[:5]:
+                print(f"  {site['site']}: {site['size_diff_mib']:+} MiB ({site['count_diff']:+} blocos)")
+        spikes = self.spikes()
+        if spikes:
+            print(f"{len(spikes)} arquivo(s) com pico de memória acima de {SPIKE_FACTOR:g}x a mediana:")
+            for path, peak, retained, memory in spikes[:TOP_FILES]:
+                stage = max(memory, key=lambda name: memory[name][1])
+                print(f"  {path}: pico de {_mib(peak)} MiB ({stage}), {_mib(retained)} MiB retidos")
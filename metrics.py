@@ -0,0 +1,184 @@
+# metrics.py
+
+import json
+import math
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Etapas da análise, na ordem do pipeline
+STAGES = ("read", "parse", "pylint", "check", "summary", "project", "write")
+PERCENTILES = (50, 95, 99)
+
+
+@contextmanager
+def measure(file_metrics, stage):
+    """
+    Mede o bloco como a etapa `stage` da análise de um arquivo.
+
+    Grava a duração em `file_metrics[stage]` e, com o tracemalloc ativo, a
+    memória retida e o pico de memória do bloco em `file_metrics["memory"][stage]`.
+    Com `file_metrics` None, não mede nada.
+    """
+    if file_metrics is None:
+        yield
+        return
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        file_metrics[stage] = time.perf_counter() - started
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            file_metrics.setdefault("memory", {})[stage] = (current - before, max(peak - before, 0))
+
+
+def percentile(samples, q):
+    """Percentil `q` (0 a 100) de amostras já ordenadas, pelo método do posto mais próximo."""
+    if not samples:
+        return None
+    rank = max(math.ceil(q / 100 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+class _Series:
+    """Durações de uma etapa ou de um checker, com os code smells encontrados e os bytes lidos."""
+    __slots__ = ("samples", "findings", "bytes")
+
+    def __init__(self):
+        self.samples = []
+        self.findings = 0
+        self.bytes = 0
+
+    def summary(self):
+        samples = sorted(self.samples)
+        summary = {"count": len(samples), "total_seconds": round(sum(samples), 6)}
+        for q in PERCENTILES:
+            value = percentile(samples, q)
+            summary[f"p{q}_seconds"] = round(value, 6) if value is not None else None
+        summary["findings"] = self.findings
+        summary["bytes"] = self.bytes
+        return summary
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsRecorder:
+    """
+    Agrega as métricas de desempenho de uma análise.
+
+    As etapas de cada arquivo (leitura, parse, pylint, checkers, resumo de
+    símbolos) são medidas onde ocorrem, inclusive nos processos de análise,
+    e chegam em `FileResult.metrics`; as etapas do processo principal
+    (gravação da saída, code smells do projeto) são medidas com `timed`.
+    Cada etapa e cada checker acumulam a quantidade de chamadas, a duração
+    total e os percentis 50, 95 e 99 das durações.
+    """
+
+    def __init__(self):
+        self.stages = {stage: _Series() for stage in STAGES}
+        self.checkers = {}
+        self.files = 0
+        self.cached_files = 0
+        self.skipped_files = 0
+        self._started = time.perf_counter()
+
+    def add_file(self, result):
+        """Acumula as métricas de um `FileResult` analisado com `metrics=True`."""
+        self.files += 1
+        if result.skipped:
+            self.skipped_files += 1
+        metrics = result.metrics
+        if metrics is None:
+            return
+        if metrics.get("cached"):
+            self.cached_files += 1
+        for stage in STAGES:
+            if stage in metrics:
+                self.stages[stage].samples.append(metrics[stage])
+        self.stages["read"].bytes += metrics.get("bytes") or 0
+        self.stages["check"].findings += len(result.smells)
+        for smell, (seconds, findings) in metrics.get("checkers", {}).items():
+            series = self.checkers.setdefault(smell, _Series())
+            series.samples.append(seconds)
+            series.findings += findings
+
+    @contextmanager
+    def timed(self, stage, findings=0):
+        """Mede a duração do bloco como uma chamada da etapa `stage`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            series = self.stages[stage]
+            series.samples.append(time.perf_counter() - started)
+            series.findings += findings
+
+    def report(self):
+        """
+        Returns:
+            dict: Métricas agregadas, prontas para serem gravadas em JSON.
+        """
+        return {
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "files": self.files,
+            "cached_files": self.cached_files,
+            "skipped_files": self.skipped_files,
+            "stages": {stage: series.summary() for stage, series in self.stages.items() if series.samples},
+            "checkers": {smell: series.summary() for smell, series in self.checkers.items()},
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, indent=2, ensure_ascii=False)
+
+    def prometheus(self):
+        """
+        Métricas no formato de texto do Prometheus, com as durações como `summary`.
+
+        Returns:
+            str: Conteúdo pronto para o textfile collector do node_exporter ou um Pushgateway.
+        """
+        report = self.report()
+        lines = [
+            "# HELP scylla_wall_seconds Duração total da análise.",
+            "# TYPE scylla_wall_seconds gauge",
+            f"scylla_wall_seconds {report['wall_seconds']}",
+        ]
+        for name, key, help_text in (("scylla_files_total", "files", "Arquivos analisados."),
+                                     ("scylla_cached_files_total", "cached_files", "Arquivos lidos do cache."),
+                                     ("scylla_skipped_files_total", "skipped_files",
+                                      "Arquivos ignorados por exceder os limites.")):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {report[key]}"]
+        lines += [
+            "# HELP scylla_bytes_read_total Bytes lidos dos arquivos analisados.",
+            "# TYPE scylla_bytes_read_total counter",
+            f"scylla_bytes_read_total {report['stages'].get('read', {}).get('bytes', 0)}",
+        ]
+
+        for metric, label, series, help_text in (
+                ("scylla_stage_seconds", "stage", report["stages"], "Duração de cada etapa da análise."),
+                ("scylla_checker_seconds", "checker", report["checkers"], "Duração de cada checker, por arquivo.")):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+            for name, summary in series.items():
+                for q in PERCENTILES:
+                    lines.append(f'{metric}{{{label}="{_label(name)}",quantile="{q / 100:g}"}} '
+                                 f'{summary[f"p{q}_seconds"]}')
+                lines.append(f'{metric}_sum{{{label}="{_label(name)}"}} {summary["total_seconds"]}')
+                lines.append(f'{metric}_count{{{label}="{_label(name)}"}} {summary["count"]}')
+
+        lines += ["# HELP scylla_checker_findings_total Code smells encontrados por cada checker.",
+                  "# TYPE scylla_checker_findings_total counter"]
+        for name, summary in report["checkers"].items():
+            lines.append(f'scylla_checker_findings_total{{checker="{_label(name)}"}} {summary["findings"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.prometheus())
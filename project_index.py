@@ -0,0 +1,633 @@
+# project_index.py
+
+import ast
+import os
+import sys
+from array import array
+from collections import Counter, deque
+from typing import NamedTuple
+
+# Decorators que não registram a função em lugar nenhum (não a tornam "usada")
+_PASSIVE_DECORATORS = {
+    "property", "staticmethod", "classmethod", "abstractmethod", "cached_property",
+    "setter", "getter", "deleter", "overload", "override", "wraps",
+}
+
+# Métodos chamados implicitamente por frameworks de teste
+_IMPLICIT_METHODS = {
+    "setUp", "tearDown", "setUpClass", "tearDownClass", "setUpTestData",
+    "asyncSetUp", "asyncTearDown", "setUpModule", "tearDownModule",
+}
+
+# Tipos de definição
+FUNCTION = 0
+METHOD = 1
+CLASS = 2
+
+# Quantidade máxima de reexportações seguidas ao resolver um nome importado
+_MAX_REEXPORT_DEPTH = 4
+
+
+def _dotted_name(node):
+    """Nome pontilhado de uma expressão `a.b.c` (ou None)."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+
+def _is_passive_decorator(decorator):
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+    name = _dotted_name(decorator)
+    return name is not None and name.rsplit(".", 1)[-1] in _PASSIVE_DECORATORS
+
+
+class _SummaryBuilder(ast.NodeVisitor):
+    """Extrai, em uma passagem com escopos, as definições e referências de um módulo."""
+
+    def __init__(self):
+        self.defs = []  # [name, kind, line, parent, rooted, bases]
+        self.names = []  # nomes referenciados em cada definição
+        self.attrs = []  # atributos (e strings identificadoras) referenciados em cada definição
+        self.module_names = set()
+        self.module_attrs = set()
+        self.imports = []  # [alias, module, name, level]
+        self.exports = []
+        self.members = []  # [índice da classe, métodos, atributos]
+        self._scope = []
+
+    def _names(self):
+        return self.names[self._scope[-1]] if self._scope else self.module_names
+
+    def _attrs(self):
+        return self.attrs[self._scope[-1]] if self._scope else self.module_attrs
+
+    def _visit_definition(self, node, kind, bases=()):
+        parent = self._scope[-1] if self._scope else -1
+        if kind != CLASS and parent >= 0 and self.defs[parent][1] == CLASS:
+            kind = METHOD
+        rooted = any(not _is_passive_decorator(d) for d in node.decorator_list)
+        index = len(self.defs)
+        self.defs.append([node.name, kind, node.lineno, parent, rooted,
+                          [name for name in map(_dotted_name, bases) if name]])
+        self.names.append(set())
+        self.attrs.append(set())
+
+        # Decorators, bases e valores padrão são atribuídos à própria definição:
+        # se ela estiver morta, não mantêm vivo o que referenciam.
+        self._scope.append(index)
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def visit_FunctionDef(self, node):
+        self._visit_definition(node, FUNCTION)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        # Mesma contagem de `LazyClassVisitor`
+        num_methods = sum(
+            1 for n in node.body if isinstance(n, ast.FunctionDef) and not n.name.startswith("__")
+        )
+        num_attributes = sum(1 for n in node.body if isinstance(n, ast.Assign))
+        self.members.append([len(self.defs), num_methods, num_attributes])
+        self._visit_definition(node, CLASS, node.bases)
+
+    def visit_Name(self, node):
+        if not isinstance(node.ctx, ast.Store):
+            self._names().add(sys.intern(node.id))
+
+    def visit_Attribute(self, node):
+        self._attrs().add(sys.intern(node.attr))
+        self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        # Strings identificadoras cobrem getattr(obj, "nome") e registros por nome
+        if isinstance(node.value, str) and len(node.value) <= 80 and node.value.isidentifier():
+            self._attrs().add(sys.intern(node.value))
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            bound = alias.asname or alias.name.split(".", 1)[0]
+            self.imports.append([bound, alias.name if alias.asname else bound, None, 0])
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            self.imports.append([alias.asname or alias.name, node.module or "", alias.name, node.level])
+
+    def visit_Assign(self, node):
+        if not self._scope and any(isinstance(t, ast.Name) and t.id == "__all__" for t in node.targets):
+            self._collect_exports(node.value)
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node):
+        if not self._scope and isinstance(node.target, ast.Name) and node.target.id == "__all__":
+            self._collect_exports(node.value)
+        self.generic_visit(node)
+
+    def _collect_exports(self, value):
+        if isinstance(value, (ast.List, ast.Tuple)):
+            for element in value.elts:
+                if isinstance(element, ast.Constant) and isinstance(element.value, str):
+                    self.exports.append(element.value)
+
+
+def summarize_module(tree):
+    """
+    Resume as definições, importações e referências de um módulo.
+
+    O resumo contém apenas tipos simples (pode ser serializado em JSON e
+    guardado no cache), de modo que a AST pode ser descartada logo após a
+    análise do arquivo.
+
+    Args:
+        tree (ast.Module): AST do módulo.
+
+    Returns:
+        dict: Resumo do módulo, consumido por `ProjectIndex.add`.
+    """
+    builder = _SummaryBuilder()
+    builder.visit(tree)
+    return {
+        "defs": builder.defs,
+        "names": [sorted(names) for names in builder.names],
+        "attrs": [sorted(attrs) for attrs in builder.attrs],
+        "module_names": sorted(builder.module_names),
+        "module_attrs": sorted(builder.module_attrs),
+        "imports": builder.imports,
+        "exports": builder.exports,
+        "members": builder.members,
+    }
+
+
+def module_name(file_path, root):
+    """Nome do módulo de `file_path` relativo ao diretório `root` (ex.: `pkg.sub.mod`)."""
+    relative = os.path.relpath(file_path, root)
+    parts = relative[:-len(".py")].replace(os.sep, "/").split("/")
+    parts = [part for part in parts if part not in ("", ".")]
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+class ClassInfo(NamedTuple):
+    """Classe do projeto, como vista por `ClassHierarchy`."""
+    id: int
+    file: str
+    line: int
+    name: str
+    methods: int
+    attributes: int
+
+
+class ClassHierarchy:
+    """
+    Grafo de herança de todas as classes do projeto.
+
+    As bases de cada classe já vêm resolvidas pelas importações. A
+    profundidade de herança de cada classe é calculada uma única vez, sob
+    demanda, e memorizada; heranças cíclicas não causam laços infinitos.
+
+    Args:
+        classes (List[ClassInfo]): Classes do projeto, na ordem dos arquivos.
+        bases (Dict[int, Tuple[int, ...]]): Por classe, a quantidade de bases
+            declaradas e os ids das bases definidas no próprio projeto.
+    """
+
+    def __init__(self, classes, bases):
+        self.classes = classes
+        self._bases = bases
+        self._depth = {}
+        self._children = Counter()
+        for _, parents in bases.values():
+            self._children.update(parents)
+
+    def depth(self, class_id):
+        """
+        Profundidade da árvore de herança da classe: 0 sem bases, 1 para
+        bases externas ao projeto (inclusive `object`) e, caso contrário,
+        1 mais a maior profundidade entre as bases.
+        """
+        depth = self._depth.get(class_id)
+        if depth is not None:
+            return depth
+        self._depth[class_id] = 0  # interrompe ciclos
+        declared, parents = self._bases[class_id]
+        depth = 1 + max((self.depth(parent) for parent in parents), default=0) if declared else 0
+        self._depth[class_id] = depth
+        return depth
+
+    def children(self, class_id):
+        """Quantidade de classes do projeto que herdam diretamente da classe."""
+        return self._children[class_id]
+
+
+class ProjectIndex:
+    """
+    Índice de símbolos de todo o projeto, usado para detectar código morto e
+    para montar a hierarquia de classes entre módulos.
+
+    Cada módulo é adicionado pelo seu resumo (`summarize_module`), e o
+    índice guarda apenas nomes internados e inteiros em arrays compactos, de
+    modo que o consumo de memória cresce com a quantidade de símbolos e não
+    com o tamanho das ASTs.
+
+    Código morto é o que não é alcançável a partir das raízes: código de nível
+    de módulo, nomes em `__all__`, reexportações de `__init__.py`, definições
+    com decorators (rotas, registros, fixtures) e testes. Referências por
+    nome são resolvidas pelo módulo e pelas suas importações (inclusive
+    entre módulos e reexportações); referências por atributo (`obj.metodo()`)
+    são resolvidas, de forma conservadora, para toda definição com esse nome.
+
+    Um arquivo adicionado de novo substitui o resumo anterior, e `remove` o
+    retira do índice, sem reconstruir os demais: as definições do resumo
+    antigo só são marcadas como removidas, e os arrays são compactados quando
+    elas passam a ser a maioria.
+
+    Args:
+        root (str): Diretório raiz usado para calcular os nomes dos módulos.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._modules = {}  # arquivo -> módulo atual, na ordem em que os arquivos foram adicionados
+        self._module_ids = {}
+        self._module_names = []
+        self._files = []
+        self._is_package = bytearray()
+        self._removed = bytearray()  # por módulo: 1 se o arquivo foi removido ou substituído
+        self._module_range = []  # por módulo: (primeira definição, fim)
+        self._module_defs = []  # por módulo: nome -> ids das funções e classes (não métodos)
+        self._module_refs = []  # por módulo: (nomes, atributos) do código de nível de módulo
+        self._imports = []  # por módulo: alias -> [(módulo, nome, nível)]
+        self._exports = []
+
+        self._def_module = array("I")
+        self._def_line = array("I")
+        self._def_parent = array("i")
+        self._def_kind = bytearray()
+        self._def_rooted = bytearray()
+        self._def_name = []
+        self._def_bases = []
+        self._def_refs = []
+        self._class_members = {}  # id da classe -> (métodos, atributos)
+        self._by_name = {}  # nome -> ids de todas as definições com esse nome
+        self._removed_defs = 0
+        self._suffixes = None
+        self._prefix = None
+        self._resolved_bases = {}
+
+    @property
+    def files(self):
+        """Arquivos no índice, na ordem em que foram adicionados pela primeira vez."""
+        return list(self._modules)
+
+    def add(self, file_path, summary):
+        """Adiciona ao índice o resumo de um arquivo, substituindo o anterior do mesmo arquivo."""
+        previous = self._modules.get(file_path)
+        if previous is not None:
+            self._discard(previous)
+
+        intern = sys.intern
+        module = len(self._files)
+        name = module_name(file_path, self.root)
+        self._module_ids.setdefault(name, module)
+        self._module_names.append(name)
+        self._files.append(file_path)
+        self._is_package.append(os.path.basename(file_path) == "__init__.py")
+        self._module_refs.append((tuple(summary["module_names"]), tuple(summary["module_attrs"])))
+        self._exports.append(tuple(intern(name) for name in summary["exports"]))
+
+        imports = {}
+        for alias, target, name, level in summary["imports"]:
+            imports.setdefault(intern(alias), []).append((target, name, level))
+        self._imports.append(imports)
+
+        first = len(self._def_name)
+        module_defs = {}
+        for (name, kind, line, parent, rooted, bases), names, attrs in zip(
+                summary["defs"], summary["names"], summary["attrs"]):
+            index = len(self._def_name)
+            name = intern(name)
+            self._def_module.append(module)
+            self._def_line.append(line)
+            self._def_parent.append(first + parent if parent >= 0 else -1)
+            self._def_kind.append(kind)
+            self._def_rooted.append(rooted)
+            self._def_name.append(name)
+            self._def_bases.append(tuple(intern(base) for base in bases))
+            self._def_refs.append((tuple(intern(n) for n in names), tuple(intern(a) for a in attrs)))
+            self._by_name.setdefault(name, []).append(index)
+            if kind != METHOD:
+                module_defs.setdefault(name, []).append(index)
+        self._module_defs.append(module_defs)
+        for index, num_methods, num_attributes in summary["members"]:
+            self._class_members[first + index] = (num_methods, num_attributes)
+
+        # Atribuir a uma chave existente mantém a posição do arquivo em `files`
+        self._modules[file_path] = module
+        self._removed.append(0)
+        self._module_range.append((first, len(self._def_name)))
+        self._changed()
+
+    def remove(self, file_path):
+        """Retira do índice o resumo de um arquivo (ex.: arquivo apagado)."""
+        module = self._modules.pop(file_path, None)
+        if module is not None:
+            self._discard(module)
+            self._changed()
+
+    def _discard(self, module):
+        """Marca as definições de um módulo como removidas e as desliga das tabelas de busca."""
+        self._removed[module] = 1
+        first, end = self._module_range[module]
+        for def_id in range(first, end):
+            ids = self._by_name[self._def_name[def_id]]
+            ids.remove(def_id)
+            if not ids:
+                del self._by_name[self._def_name[def_id]]
+            self._class_members.pop(def_id, None)
+            self._def_bases[def_id] = ()
+            self._def_refs[def_id] = ((), ())
+        self._removed_defs += end - first
+
+        self._module_defs[module] = {}
+        self._module_refs[module] = ((), ())
+        self._imports[module] = {}
+        self._exports[module] = ()
+
+        # Outro arquivo com o mesmo nome de módulo passa a responder por ele
+        name = self._module_names[module]
+        if self._module_ids.get(name) == module:
+            del self._module_ids[name]
+            others = [other for other in self._modules.values()
+                      if other != module and self._module_names[other] == name]
+            if others:
+                self._module_ids[name] = min(others)
+
+    def _changed(self):
+        """Descarta as resoluções memorizadas e compacta os arrays se preciso."""
+        self._suffixes = None
+        self._prefix = None
+        self._resolved_bases = {}
+        if self._removed_defs * 2 > len(self._def_name):
+            self._compact()
+
+    def _compact(self):
+        """Reconstrói o índice apenas com os módulos atuais, liberando as definições removidas."""
+        summaries = [(file_path, self._summary(module)) for file_path, module in self._modules.items()]
+        self.__init__(self.root)
+        for file_path, summary in summaries:
+            self.add(file_path, summary)
+
+    def _summary(self, module):
+        """Resumo (ver `summarize_module`) equivalente ao adicionado para o módulo."""
+        first, end = self._module_range[module]
+        defs = []
+        members = []
+        for def_id in range(first, end):
+            parent = self._def_parent[def_id]
+            defs.append([self._def_name[def_id], self._def_kind[def_id], self._def_line[def_id],
+                         parent - first if parent >= 0 else -1, bool(self._def_rooted[def_id]),
+                         list(self._def_bases[def_id])])
+            if def_id in self._class_members:
+                members.append([def_id - first, *self._class_members[def_id]])
+        module_names, module_attrs = self._module_refs[module]
+        return {
+            "defs": defs,
+            "names": [self._def_refs[def_id][0] for def_id in range(first, end)],
+            "attrs": [self._def_refs[def_id][1] for def_id in range(first, end)],
+            "module_names": module_names,
+            "module_attrs": module_attrs,
+            "imports": [[alias, target, name, level]
+                        for alias, entries in self._imports[module].items() for target, name, level in entries],
+            "exports": list(self._exports[module]),
+            "members": members,
+        }
+
+    def _package_prefix(self):
+        """
+        Nome absoluto do pacote analisado, quando a raiz é ela própria um pacote.
+
+        Os módulos são nomeados a partir da raiz, mas as importações absolutas
+        dentro do pacote usam o nome completo (`django.db.models.fields`). O
+        prefixo é inferido pelas importações que terminam em um módulo do índice.
+        """
+        if self._prefix is None:
+            self._prefix = ""
+            root = self._module_ids.get("")
+            if root is not None and self._is_package[root]:
+                counts = Counter()
+                for imports in self._imports:
+                    for entries in imports.values():
+                        for target, _, level in entries:
+                            parts = target.split(".") if not level else []
+                            for i in range(1, len(parts)):
+                                if ".".join(parts[i:]) in self._module_ids:
+                                    counts[".".join(parts[:i])] += 1
+                                    break
+                if counts:
+                    self._prefix = counts.most_common(1)[0][0]
+        return self._prefix
+
+    def _find_module(self, name):
+        module = self._module_ids.get(name)
+        if module is not None:
+            return module
+        prefix = self._package_prefix()
+        if prefix and (name == prefix or name.startswith(prefix + ".")):
+            return self._module_ids.get(name[len(prefix) + 1:])
+        if not name:
+            return None
+        # A raiz analisada pode não ser a raiz do sys.path (ex.: projetos em src/)
+        if self._suffixes is None:
+            self._suffixes = {}
+            for full_name, module_id in self._module_ids.items():
+                parts = full_name.split(".")
+                for i in range(1, len(parts)):
+                    self._suffixes.setdefault(".".join(parts[i:]), module_id)
+        return self._suffixes.get(name)
+
+    def _target_module(self, module, target, level):
+        if level:
+            name = self._module_names[module]
+            parts = name.split(".") if name else []
+            if not self._is_package[module]:
+                parts = parts[:-1]
+            if level > 1:
+                parts = parts[:len(parts) - (level - 1)]
+            target = ".".join(parts + ([target] if target else []))
+        return self._find_module(target)
+
+    def _resolve_symbol(self, module, parts, depth=0):
+        """
+        Id da definição de nível de módulo à qual o nome pontilhado `parts` se
+        refere dentro de `module`, seguindo importações e reexportações.
+        """
+        if not parts:
+            return None
+        head, rest = parts[0], parts[1:]
+        if not rest:
+            defs = [d for d in self._module_defs[module].get(head, ()) if self._def_parent[d] < 0]
+            if defs:
+                return defs[-1]
+        if depth >= _MAX_REEXPORT_DEPTH:
+            return None
+
+        for target, name, level in self._imports[module].get(head, ()):
+            found = None
+            if name is None:
+                # import pacote.modulo [as alias]: o restante pode conter submódulos
+                for i in range(len(rest) - 1, -1, -1):
+                    target_module = self._find_module(".".join([target, *rest[:i]]))
+                    if target_module is not None:
+                        found = self._resolve_symbol(target_module, rest[i:], depth + 1)
+                        break
+            else:
+                # from modulo import nome: `nome` pode ser um símbolo ou um submódulo
+                target_module = self._target_module(module, target, level)
+                if target_module is not None:
+                    found = self._resolve_symbol(target_module, [name, *rest], depth + 1)
+                if found is None:
+                    submodule = self._target_module(module, f"{target}.{name}" if target else name, level)
+                    if submodule is not None:
+                        found = self._resolve_symbol(submodule, rest, depth + 1)
+            if found is not None:
+                return found
+
+        if not rest:
+            for target, _, level in self._imports[module].get("*", ()):
+                target_module = self._target_module(module, target, level)
+                if target_module is not None:
+                    found = self._resolve_symbol(target_module, parts, depth + 1)
+                    if found is not None:
+                        return found
+        return None
+
+    def _resolve_base(self, def_id, base):
+        """Id da classe do projeto referida pela base `base` da classe `def_id` (ou None)."""
+        module = self._def_module[def_id]
+        key = (module, base)
+        if key not in self._resolved_bases:
+            found = self._resolve_symbol(module, base.split("."))
+            self._resolved_bases[key] = found if found is not None and self._def_kind[found] == CLASS else None
+        return self._resolved_bases[key]
+
+    def class_hierarchy(self):
+        """
+        Monta o grafo de herança das classes do projeto.
+
+        Returns:
+            ClassHierarchy: Classes, na ordem dos arquivos adicionados, e suas bases.
+        """
+        classes = []
+        bases = {}
+        for def_id in range(len(self._def_name)):
+            if self._def_kind[def_id] != CLASS or self._removed[self._def_module[def_id]]:
+                continue
+            num_methods, num_attributes = self._class_members.get(def_id, (0, 0))
+            classes.append(ClassInfo(def_id, self._files[self._def_module[def_id]], self._def_line[def_id],
+                                     self._def_name[def_id], num_methods, num_attributes))
+            parents = []
+            for base in self._def_bases[def_id]:
+                parent = self._resolve_base(def_id, base)
+                if parent is not None and parent != def_id and parent not in parents:
+                    parents.append(parent)
+            bases[def_id] = (len(self._def_bases[def_id]), tuple(parents))
+        return ClassHierarchy(classes, bases)
+
+    def dead_code(self):
+        """
+        Calcula as funções, métodos e classes não alcançáveis.
+
+        Apenas a definição mais externa de cada trecho morto é reportada (os
+        métodos de uma classe morta não são listados separadamente).
+
+        Returns:
+            List[Tuple[str, int, str, int]]: (arquivo, linha, nome, tipo) de cada
+                definição morta, na ordem dos arquivos adicionados.
+        """
+        total = len(self._def_name)
+        live = bytearray(total)
+        queue = deque()
+        resolved_names = set()
+        resolved_attrs = set()
+
+        def mark(def_ids):
+            for def_id in def_ids:
+                if not live[def_id]:
+                    live[def_id] = 1
+                    queue.append(def_id)
+
+        def resolve_name(module, name, depth=0):
+            if (module, name) in resolved_names:
+                return
+            resolved_names.add((module, name))
+            mark(self._module_defs[module].get(name, ()))
+            if depth >= _MAX_REEXPORT_DEPTH:
+                return
+            for target, imported, level in self._imports[module].get(name, ()):
+                target_module = self._target_module(module, target, level)
+                if target_module is None:
+                    continue
+                if imported is not None:
+                    resolve_name(target_module, sys.intern(imported), depth + 1)
+            for target, _, level in self._imports[module].get("*", ()):
+                target_module = self._target_module(module, target, level)
+                if target_module is not None:
+                    resolve_name(target_module, name, depth + 1)
+
+        def resolve_refs(module, names, attrs):
+            for name in names:
+                resolve_name(module, name)
+            for attr in attrs:
+                if attr not in resolved_attrs:
+                    resolved_attrs.add(attr)
+                    mark(self._by_name.get(attr, ()))
+
+        # Raízes
+        for module in self._modules.values():
+            resolve_refs(module, *self._module_refs[module])
+            for name in self._exports[module]:
+                resolve_name(module, name)
+            if self._is_package[module]:
+                for alias in self._imports[module]:
+                    resolve_name(module, alias)
+        for def_id in range(total):
+            if self._removed[self._def_module[def_id]]:
+                continue
+            name = self._def_name[def_id]
+            if self._def_rooted[def_id] or name.startswith("test") or name.startswith("Test"):
+                mark((def_id,))
+
+        # Métodos de cada classe, para propagar métodos implícitos
+        methods = {}
+        for def_id in range(total):
+            if self._def_kind[def_id] == METHOD:
+                methods.setdefault(self._def_parent[def_id], []).append(def_id)
+
+        while queue:
+            def_id = queue.popleft()
+            resolve_refs(self._def_module[def_id], *self._def_refs[def_id])
+            if self._def_kind[def_id] == CLASS:
+                external = any(self._resolve_base(def_id, base) is None and base != "object"
+                               for base in self._def_bases[def_id])
+                for method in methods.get(def_id, ()):
+                    name = self._def_name[method]
+                    # Métodos especiais, ganchos de teste e sobrescritas de classes externas
+                    if external or (name.startswith("__") and name.endswith("__")) or name in _IMPLICIT_METHODS:
+                        mark((method,))
+
+        dead = []
+        for def_id in range(total):
+            parent = self._def_parent[def_id]
+            if live[def_id] or (parent >= 0 and not live[parent]) or self._removed[self._def_module[def_id]]:
+                continue
+            dead.append((self._files[self._def_module[def_id]], self._def_line[def_id],
+                         self._def_name[def_id], self._def_kind[def_id]))
+        return dead
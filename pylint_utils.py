@@ -1,12 +1,291 @@
 # pylint_utils.py
 
-import subprocess
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from typing import List, NamedTuple
 
-def run_pylint(file_path):
-    """Executa o pylint com configurações personalizadas e captura a saída."""
-    result = subprocess.run(
-        ["pylint", file_path, "--max-public-methods=0", "--max-attributes=0"],
-        text=True,
-        capture_output=True
+import astroid
+from pylint.lint import PyLinter
+from pylint.reporters import BaseReporter
+
+from limits import CHECK_INTERVAL, FileLimitExceeded, FileLimits, enforce_limits
+
+# Configurações personalizadas usadas em todas as execuções do pylint
+PYLINT_OPTIONS = {
+    "max-public-methods": 0,
+    "max-attributes": 0,
+}
+
+# Folga para a inicialização de cada processo do pylint, que não conta no tempo limite dos arquivos
+PYLINT_STARTUP_SECONDS = 3.0
+
+# Este módulo, executado como script, é o processo externo do pylint (ver `lint_files`)
+_PYLINT_SCRIPT = os.path.abspath(__file__)
+
+
+class PylintMessage(NamedTuple):
+    """Mensagem emitida pelo pylint para um arquivo."""
+    path: str
+    line: int
+    column: int
+    msg_id: str
+    symbol: str
+    message: str
+
+
+def _parse_script_output(output, file_paths):
+    """Converte a saída de `lint_files` (executado como script) nas mensagens de cada arquivo."""
+    index = {path: [] for path in file_paths}
+    for path, result in json.loads(output or "{}").items():
+        if path not in index:
+            continue
+        if "skipped" in result:
+            index[path] = FileLimitExceeded(result["skipped"])
+        else:
+            index[path] = [PylintMessage(*message) for message in result["messages"]]
+    return index
+
+
+async def _run_pylint_process(file_paths, limits=None):
+    """
+    Executa um processo do pylint para um lote de arquivos.
+
+    O processo executa este módulo como script (ver `lint_files`): um único
+    `PylintEngine` analisa cada arquivo do lote separadamente, como na análise
+    em processo. Assim os resultados não dependem dos outros arquivos do lote
+    (o pylint de linha de comando, com vários arquivos, resolve as importações
+    de todos eles com o mesmo `sys.path`, o que muda a inferência), e os
+    limites valem por arquivo: o tempo de inicialização e o dos outros
+    arquivos não contam, e a memória é o crescimento durante a análise do
+    arquivo. Por segurança, com tempo limite o processo é morto se demorar
+    mais que `PYLINT_STARTUP_SECONDS` além do limite por arquivo (ex.: preso
+    em código C, que o timer não interrompe).
+
+    Returns:
+        Dict[str, Union[List[PylintMessage], FileLimitExceeded]]: Mensagens do
+            pylint por arquivo ou o limite excedido pelo arquivo.
+
+    Raises:
+        FileLimitExceeded: Se o processo precisar ser morto.
+    """
+    command = [sys.executable, _PYLINT_SCRIPT, *file_paths]
+    if limits is not None and limits.timeout is not None:
+        command.append(f"--file-timeout={limits.timeout}")
+    if limits is not None and limits.memory is not None:
+        command.append(f"--file-memory={limits.memory}")
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
-    return result.stdout
+    communicate = asyncio.ensure_future(process.communicate())
+    if limits is None or limits.timeout is None:
+        stdout, _ = await communicate
+    else:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + PYLINT_STARTUP_SECONDS + (limits.timeout + PYLINT_STARTUP_SECONDS) * len(file_paths)
+        while True:
+            done, _ = await asyncio.wait({communicate}, timeout=CHECK_INTERVAL)
+            if done:
+                stdout, _ = communicate.result()
+                break
+            if loop.time() > deadline:
+                process.kill()
+                await communicate
+                raise FileLimitExceeded(f"pylint: tempo limite de {limits.timeout:g}s excedido")
+
+    return _parse_script_output(stdout.decode("utf-8", errors="replace"), file_paths)
+
+
+async def run_pylint_batch_async(file_paths, semaphore=None, limits=None):
+    """
+    Executa o pylint em um único subprocesso para um lote de arquivos, sem bloquear o event loop.
+
+    Os arquivos que excedem os limites ficam sem mensagens (ver
+    `_run_pylint_process`). Se o processo do lote precisar ser morto, seus
+    arquivos são analisados um a um.
+
+    Args:
+        file_paths (List[str]): Caminhos dos arquivos Python.
+        semaphore (asyncio.Semaphore): Limita quantos processos do pylint executam
+            ao mesmo tempo. None não impõe limite.
+        limits (FileLimits): Limites de tempo e de memória por arquivo.
+
+    Returns:
+        Dict[str, Union[List[PylintMessage], FileLimitExceeded]]: Mensagens do
+            pylint por arquivo, com as mesmas chaves recebidas em `file_paths`,
+            ou o limite excedido pelo arquivo.
+    """
+    if not file_paths:
+        return {}
+    try:
+        async with semaphore or contextlib.nullcontext():
+            return await _run_pylint_process(file_paths, limits)
+    except FileLimitExceeded as error:
+        if len(file_paths) == 1:
+            return {file_paths[0]: error}
+        index = {}
+        for path in file_paths:
+            index.update(await run_pylint_batch_async([path], semaphore, limits))
+        return index
+
+
+def run_pylint_batch(file_paths, batch_size=200, concurrency=1, limits=None):
+    """
+    Executa o pylint em lotes de arquivos, com um único processo por lote.
+
+    A saída em JSON é separada por arquivo, formando um índice de mensagens
+    que os checkers consultam sem precisar interpretar texto. Até
+    `concurrency` lotes são executados ao mesmo tempo.
+
+    Args:
+        file_paths (List[str]): Caminhos dos arquivos Python.
+        batch_size (int): Quantidade máxima de arquivos por execução do pylint.
+        concurrency (int): Quantidade máxima de processos do pylint simultâneos.
+        limits (FileLimits): Limites de tempo e de memória por arquivo.
+
+    Returns:
+        Dict[str, Union[List[PylintMessage], FileLimitExceeded]]: Mensagens do
+            pylint por arquivo, com as mesmas chaves recebidas em `file_paths`,
+            ou o limite excedido pelo arquivo.
+    """
+    async def run_batches():
+        semaphore = asyncio.Semaphore(concurrency)
+        batches = [file_paths[start:start + batch_size] for start in range(0, len(file_paths), batch_size)]
+        return await asyncio.gather(*(run_pylint_batch_async(batch, semaphore, limits) for batch in batches))
+
+    index = {path: [] for path in file_paths}
+    if file_paths:
+        for messages in asyncio.run(run_batches()):
+            index.update(messages)
+    return index
+
+
+def run_pylint(file_path):
+    """Executa o pylint com configurações personalizadas e captura as mensagens."""
+    return run_pylint_batch([file_path])[file_path]
+
+
+class MessageCollector(BaseReporter):
+    """Reporter do pylint que guarda as mensagens como `PylintMessage`."""
+
+    name = "scylla-collector"
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def reset(self):
+        self.messages = []
+
+    def handle_message(self, msg):
+        self.messages.append(
+            PylintMessage(msg.path, msg.line, msg.column, msg.msg_id, msg.symbol, msg.msg)
+        )
+
+    def _display(self, layout):
+        pass
+
+
+class PylintEngine:
+    """
+    Executa o pylint dentro do próprio processo.
+
+    Um único `PyLinter` é configurado na criação do engine e reaproveitado
+    para todos os arquivos, de modo que o pylint e o astroid são importados
+    uma vez só e o cache de módulos do astroid permanece aquecido entre
+    arquivos.
+    """
+
+    def __init__(self):
+        self.reporter = MessageCollector()
+        self.linter = PyLinter(reporter=self.reporter)
+        self.linter.load_default_plugins()
+        for name, value in PYLINT_OPTIONS.items():
+            self.linter.set_option(name, value)
+        self.linter.set_option("persistent", False)
+        self.linter.disable("I")
+
+    def run(self, file_path) -> List[PylintMessage]:
+        """
+        Analisa um arquivo com o linter compartilhado.
+
+        Args:
+            file_path (str): Caminho do arquivo Python.
+
+        Returns:
+            List[PylintMessage]: Mensagens emitidas pelo pylint para o arquivo.
+        """
+        self.reporter.reset()
+        self.linter.check([file_path])
+        return self.reporter.messages
+
+    def forget(self, file_paths):
+        """
+        Descarta do cache do astroid os módulos dos arquivos informados.
+
+        O astroid reaproveita a árvore de um módulo já analisado enquanto o
+        caminho for o mesmo, sem verificar se o arquivo mudou. Arquivos
+        alterados desde a última análise precisam ser descartados antes de
+        serem analisados de novo.
+
+        Args:
+            file_paths (Iterable[str]): Caminhos dos arquivos alterados.
+        """
+        paths = {os.path.abspath(path) for path in file_paths}
+        cache = astroid.MANAGER.astroid_cache
+        for name, module in list(cache.items()):
+            if module.file and os.path.abspath(module.file) in paths:
+                del cache[name]
+
+
+def lint_files(file_paths, limits=None):
+    """
+    Analisa os arquivos com um `PylintEngine`, um de cada vez, com os limites aplicados.
+
+    É a etapa do pylint da análise em processo, usada pelo pylint externo:
+    este módulo é executado como script e grava o resultado em JSON na saída
+    padrão.
+
+    Args:
+        file_paths (List[str]): Caminhos dos arquivos Python.
+        limits (FileLimits): Limites de tempo e de memória por arquivo. None não aplica nenhum.
+
+    Returns:
+        Dict[str, dict]: Por arquivo, `{"messages": [...]}` com os campos de cada
+            `PylintMessage`, ou `{"skipped": motivo}` se o arquivo excedeu um limite.
+    """
+    engine = PylintEngine()
+    results = {}
+    for path in file_paths:
+        try:
+            with enforce_limits(limits, "pylint"):
+                messages = engine.run(path)
+        except FileLimitExceeded as error:
+            results[path] = {"skipped": error.reason}
+            # O engine foi interrompido no meio de um arquivo e pode ter ficado inconsistente
+            engine = PylintEngine()
+            continue
+        results[path] = {"messages": [list(message) for message in messages]}
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Executa o pylint nos arquivos, com limites por arquivo, e grava as mensagens em JSON.")
+    parser.add_argument("files", nargs="+", help="Arquivos Python.")
+    parser.add_argument("--file-timeout", type=float, help="Tempo máximo do pylint em cada arquivo, em segundos.")
+    parser.add_argument("--file-memory", type=int, help="Crescimento máximo da memória em cada arquivo, em MB.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # Só o JSON vai para a saída padrão
+    with contextlib.redirect_stdout(sys.stderr):
+        lint_results = lint_files(args.files, FileLimits(args.file_timeout, args.file_memory))
+    json.dump(lint_results, sys.stdout)
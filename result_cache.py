@@ -0,0 +1,114 @@
+# result_cache.py
+
+import hashlib
+import json
+import sqlite3
+
+from smell import Smell, SmellKind, SmellList
+
+DEFAULT_CACHE_FILE = ".scylla_cache.sqlite"
+
+
+def config_key(**parts):
+    """
+    Gera a chave de configuração do cache a partir dos valores que influenciam
+    os resultados (versões, limites, opções do pylint).
+    """
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _from_json(args):
+    """Restaura as tuplas de `Smell.args`, que o JSON grava como listas."""
+    if isinstance(args, list):
+        return tuple(_from_json(arg) for arg in args)
+    return args
+
+
+class ResultCache:
+    """
+    Cache persistente, em SQLite, dos code smells de cada arquivo.
+
+    As entradas são indexadas pelo hash do conteúdo do arquivo e pela chave de
+    configuração, e não guardam o caminho do arquivo: um arquivo renomeado ou
+    copiado continua sendo servido pelo cache. O banco usa WAL, então vários
+    processos de análise podem ler e gravar ao mesmo tempo, cada um com a
+    própria conexão.
+
+    Args:
+        path (str): Caminho do banco SQLite.
+        config (str): Chave de configuração gerada por `config_key`.
+    """
+
+    def __init__(self, path, config):
+        self.path = path
+        self.config = config
+        self._connection = sqlite3.connect(path, timeout=60)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS findings ("
+                " content_hash TEXT NOT NULL,"
+                " config TEXT NOT NULL,"
+                " smells TEXT NOT NULL,"
+                " PRIMARY KEY (content_hash, config))"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " content_hash TEXT NOT NULL,"
+                " config TEXT NOT NULL,"
+                " summary TEXT NOT NULL,"
+                " PRIMARY KEY (content_hash, config))"
+            )
+
+    def get(self, file_path, content_hash):
+        """
+        Busca os code smells de um conteúdo já analisado.
+
+        Args:
+            file_path (str): Caminho do arquivo dos code smells devolvidos.
+            content_hash (str): Hash do conteúdo do arquivo.
+
+        Returns:
+            Optional[SmellList]: Code smells do arquivo ou None se não estiver no cache.
+        """
+        row = self._connection.execute(
+            "SELECT smells FROM findings WHERE content_hash = ? AND config = ?",
+            (content_hash, self.config),
+        ).fetchone()
+        if row is None:
+            return None
+        smells = SmellList(file_path)
+        smells.extend(Smell(smells.path_id, start, end, SmellKind[kind], _from_json(args))
+                      for start, end, kind, args in json.loads(row[0]))
+        return smells
+
+    def put(self, content_hash, smells):
+        """Guarda os code smells de um conteúdo. A gravação ocorre em `commit`."""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO findings (content_hash, config, smells) VALUES (?, ?, ?)",
+            (content_hash, self.config,
+             json.dumps([[smell.start, smell.end, smell.kind.name, smell.args] for smell in smells])),
+        )
+
+    def get_summary(self, content_hash):
+        """Busca o resumo de símbolos (ver `project_index.summarize_module`) de um conteúdo."""
+        row = self._connection.execute(
+            "SELECT summary FROM summaries WHERE content_hash = ? AND config = ?",
+            (content_hash, self.config),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def put_summary(self, content_hash, summary):
+        """Guarda o resumo de símbolos de um conteúdo. A gravação ocorre em `commit`."""
+        self._connection.execute(
+            "INSERT OR REPLACE INTO summaries (content_hash, config, summary) VALUES (?, ?, ?)",
+            (content_hash, self.config, json.dumps(summary)),
+        )
+
+    def commit(self):
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,73 @@
+# result_sink.py
+
+import csv
+import gzip
+
+HEADERS = [
+    "arquivo",
+    "linha inicial",
+    "linha final",
+    "code smells",
+    "descrição"
+]
+
+
+def smell_to_row(smell):
+    """Converte um `Smell` em uma linha do CSV de saída, formatando só agora a sua descrição."""
+    return {
+        "arquivo": smell.path.replace("\\", "/"),
+        "linha inicial": smell.start,
+        "linha final": smell.end,
+        "code smells": smell.label,
+        "descrição": smell.description
+    }
+
+
+class CsvResultSink:
+    """
+    Grava os code smells no CSV de saída à medida que cada arquivo é analisado.
+
+    Nada é acumulado em memória: as linhas de cada arquivo são escritas assim
+    que chegam e o arquivo é descarregado no disco a cada `flush_every`
+    arquivos, de modo que uma interrupção preserva o que já foi analisado.
+    Saídas terminadas em `.gz` são comprimidas com gzip.
+
+    Args:
+        output_file (str): Caminho do CSV de saída.
+        flush_every (int): Quantidade de arquivos entre descargas no disco.
+        compress (bool): Força (ou desativa) a compressão gzip. Por padrão,
+            depende da extensão de `output_file`.
+    """
+
+    def __init__(self, output_file="code_smells.csv", flush_every=100, compress=None):
+        if compress is None:
+            compress = output_file.endswith(".gz")
+        self.output_file = output_file
+        self.flush_every = flush_every
+        if compress:
+            self._file = gzip.open(output_file, mode="wt", newline="", encoding="utf-8")
+        else:
+            self._file = open(output_file, mode="w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=HEADERS)
+        self._writer.writeheader()
+        self.files_written = 0
+        self.rows_written = 0
+
+    def write(self, smells):
+        """Grava os code smells de um arquivo analisado."""
+        for smell in smells:
+            self._writer.writerow(smell_to_row(smell))
+            self.rows_written += 1
+
+        self.files_written += 1
+        if self.files_written % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
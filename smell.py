@@ -0,0 +1,238 @@
+# smell.py
+
+from array import array
+from enum import Enum
+from typing import Any, NamedTuple
+
+
+class SmellKind(Enum):
+    """Tipos de code smell; o valor é o nome usado no registro dos checkers."""
+    TOO_MANY_ARGUMENTS = "Too Many Arguments"
+    LONG_METHOD = "Long Method"
+    LARGE_CLASS = "Large Class"
+    DEAD_CODE = "Dead Code"
+    LAZY_CLASS = "Lazy Class"
+    PARALLEL_INHERITANCE = "Parallel Inheritance Hierarchies"
+    MAGIC_NUMBER = "Magic Number"
+
+
+class PathTable:
+    """
+    Tabela de caminhos compartilhada pelos code smells.
+
+    Cada caminho é guardado uma única vez e os code smells o referenciam por
+    um inteiro, em vez de cada um guardar (ou manter vivo) o seu próprio texto.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._paths = []
+
+    def intern(self, path):
+        """Retorna o identificador de `path`, registrando-o se ainda não existir."""
+        path_id = self._ids.get(path)
+        if path_id is None:
+            path_id = self._ids[path] = len(self._paths)
+            self._paths.append(path)
+        return path_id
+
+    def __getitem__(self, path_id):
+        return self._paths[path_id]
+
+    def __len__(self):
+        return len(self._paths)
+
+
+PATHS = PathTable()
+
+
+#--------------------------------------------------------------------------------------#
+# Rótulo (coluna "code smells" da saída) e descrição de cada tipo, montados a partir de
+# `Smell.args` apenas quando o code smell é gravado ou mostrado.
+
+def _label_with_name(kind):
+    return lambda args: f"{kind.value}: {args[0]}"
+
+
+def _long_method_description(args):
+    # Contagem física: um inteiro; contagem lógica (--long-method-logical): ("lógicas", linhas)
+    if isinstance(args, tuple):
+        return f"Total de linhas {args[0]}: {args[1]}"
+    return f"Total de linhas: {args}"
+
+
+def _lazy_class_description(args):
+    # (classe, métodos, atributos, profundidade), com None nas regras não violadas
+    _, num_methods, num_attributes, inheritance_depth = args
+    reason = []
+    if num_methods is not None:
+        reason.append(f"Methods < 5 XOR Attributes < 5 (methods={num_methods}, attributes={num_attributes})")
+    if inheritance_depth is not None:
+        reason.append(f"Inheritance depth < 2 (depth={inheritance_depth})")
+    return "; ".join(reason)
+
+
+def _parallel_inheritance_description(args):
+    # (classe, profundidade, filhas), com None nas regras não violadas
+    _, depth, children = args
+    reason = []
+    if depth is not None:
+        reason.append(f"Inheritance depth > 3 (depth={depth})")
+    if children is not None:
+        reason.append(f"Number of child classes > 4 (children={children})")
+    return "; ".join(reason)
+
+
+_LABELS = {
+    # O rótulo de Large Class sempre foi gravado assim na saída
+    SmellKind.LARGE_CLASS: lambda args: "Large Class: ",
+    SmellKind.LAZY_CLASS: _label_with_name(SmellKind.LAZY_CLASS),
+    SmellKind.PARALLEL_INHERITANCE: _label_with_name(SmellKind.PARALLEL_INHERITANCE),
+}
+
+_DESCRIPTIONS = {
+    SmellKind.TOO_MANY_ARGUMENTS:
+        lambda args: f"A função possui {args} argumentos, excedendo o limite recomendado.",
+    SmellKind.LONG_METHOD: _long_method_description,
+    SmellKind.LARGE_CLASS: lambda args: f" Total de atributos: {args[0]}, Total de Linhas: {args[1]}",
+    # Texto livre (mensagem gerada pelo pylint ou nome não utilizado), já montado
+    # pelo checker: uma tupla com as partes ocuparia mais que o texto
+    SmellKind.DEAD_CODE: lambda args: args,
+    SmellKind.LAZY_CLASS: _lazy_class_description,
+    SmellKind.PARALLEL_INHERITANCE: _parallel_inheritance_description,
+    SmellKind.MAGIC_NUMBER: lambda args: (
+        "When there is a numerical literal, except commonly used 0, -1, and 1, without any definition for that."),
+}
+
+
+def _unpickle_smell(path, start, end, kind, args):
+    return Smell.at(path, start, end, kind, args)
+
+
+class Smell(NamedTuple):
+    """
+    Code smell encontrado em um arquivo.
+
+    O caminho é guardado em `PATHS` e referenciado por `path_id`; a descrição
+    não é montada na detecção: `args` guarda apenas os valores medidos pelo
+    checker (um escalar quando há um só valor) e `label`/`description` os
+    formatam quando o code smell é gravado ou mostrado.
+
+    Attributes:
+        path_id (int): Identificador do caminho do arquivo em `PATHS`.
+        start (int): Linha inicial.
+        end (int): Linha final.
+        kind (SmellKind): Tipo do code smell.
+        args (Any): Valores usados em `label` e `description`.
+    """
+    path_id: int
+    start: int
+    end: int
+    kind: SmellKind
+    args: Any = None
+
+    @classmethod
+    def at(cls, path, start, end, kind, args=None):
+        """Cria um code smell no arquivo `path`, registrando o caminho em `PATHS`."""
+        return cls(PATHS.intern(path), start, end, kind, args)
+
+    @property
+    def path(self):
+        return PATHS[self.path_id]
+
+    @property
+    def label(self):
+        """Tipo do code smell como gravado na coluna "code smells" da saída."""
+        label = _LABELS.get(self.kind)
+        return label(self.args) if label is not None else self.kind.value
+
+    @property
+    def description(self):
+        return _DESCRIPTIONS[self.kind](self.args)
+
+    def __reduce__(self):
+        # Os identificadores só valem no processo que os criou: entre processos
+        # (ex.: `--jobs`), o caminho é enviado e registrado de novo no destino.
+        return _unpickle_smell, (self.path, self.start, self.end, self.kind, self.args)
+
+
+_KINDS = list(SmellKind)
+_KIND_INDEX = {kind: index for index, kind in enumerate(_KINDS)}
+
+
+def _unpickle_smell_list(path, starts, ends, kinds, args):
+    smells = SmellList(path)
+    smells._starts, smells._ends, smells._kinds, smells._args = starts, ends, kinds, args
+    return smells
+
+
+class SmellList:
+    """
+    Code smells de um arquivo, guardados em colunas.
+
+    Em vez de um `Smell` por code smell, as linhas ficam em arrays de
+    inteiros, o tipo em um byte e apenas `args` em uma lista; o caminho é
+    guardado uma única vez. Cada `Smell` é criado ao ser lido (iteração ou
+    índice), de modo que os resultados mantidos em memória (daemon, modo
+    watch, avaliação) custam alguns bytes por code smell além dos `args`.
+
+    Args:
+        path (str): Arquivo dos code smells.
+        smells (Iterable[Smell]): Code smells iniciais, todos do arquivo `path`.
+    """
+
+    __slots__ = ("path_id", "_starts", "_ends", "_kinds", "_args")
+
+    def __init__(self, path, smells=()):
+        self.path_id = PATHS.intern(path)
+        self._starts = array("I")
+        self._ends = array("I")
+        self._kinds = bytearray()
+        self._args = []
+        self.extend(smells)
+
+    @property
+    def path(self):
+        return PATHS[self.path_id]
+
+    def append(self, smell):
+        """
+        Acrescenta um code smell.
+
+        Raises:
+            ValueError: Se o code smell for de outro arquivo.
+        """
+        if smell.path_id != self.path_id:
+            raise ValueError(f"Code smell de {smell.path} em uma lista de {self.path}.")
+        self._starts.append(smell.start)
+        self._ends.append(smell.end)
+        self._kinds.append(_KIND_INDEX[smell.kind])
+        self._args.append(smell.args)
+
+    def extend(self, smells):
+        for smell in smells:
+            self.append(smell)
+
+    def __len__(self):
+        return len(self._args)
+
+    def __getitem__(self, index):
+        return Smell(self.path_id, self._starts[index], self._ends[index], _KINDS[self._kinds[index]],
+                     self._args[index])
+
+    def __iter__(self):
+        path_id = self.path_id
+        for start, end, kind, args in zip(self._starts, self._ends, self._kinds, self._args):
+            yield Smell(path_id, start, end, _KINDS[kind], args)
+
+    def __eq__(self, other):
+        if isinstance(other, SmellList):
+            return self.path_id == other.path_id and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"SmellList({self.path!r}, {list(self)!r})"
+
+    def __reduce__(self):
+        # Como em `Smell`: o caminho é registrado de novo no processo de destino
+        return _unpickle_smell_list, (self.path, self._starts, self._ends, self._kinds, self._args)
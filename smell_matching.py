@@ -0,0 +1,215 @@
+# smell_matching.py
+
+import argparse
+import csv
+import heapq
+from collections import defaultdict
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class Finding(NamedTuple):
+    """Code smell de um relatório, no formato `System,Package,Module,Smell,Line Ini,Line Fin`."""
+    system: str
+    package: str
+    module: str
+    smell: str
+    start: int
+    end: int  # igual a `start` quando o relatório não informa a linha final
+
+    @property
+    def key(self):
+        return self.package, self.module, self.smell.casefold()
+
+
+class MatchCriteria(NamedTuple):
+    """
+    Critério para considerar dois code smells (com a mesma chave) equivalentes.
+
+    Sem nenhum campo informado, basta que os intervalos de linhas se sobreponham.
+
+    Attributes:
+        min_iou (float): Exige que a interseção dividida pela união dos
+            intervalos (em linhas) seja ao menos este valor.
+        start_tolerance (int): Compara apenas as linhas iniciais, que podem
+            diferir em até este número de linhas. Útil quando um dos relatórios
+            não informa a linha final.
+    """
+    min_iou: Optional[float] = None
+    start_tolerance: Optional[int] = None
+
+
+class MatchResult(NamedTuple):
+    """Resultado da comparação de dois relatórios."""
+    matches: List[Tuple[Finding, Finding]]  # (referência, candidato)
+    missed: List[Finding]  # só na referência
+    extra: List[Finding]  # só no candidato
+
+    @property
+    def precision(self):
+        total = len(self.matches) + len(self.extra)
+        return len(self.matches) / total if total else None
+
+    @property
+    def recall(self):
+        total = len(self.matches) + len(self.missed)
+        return len(self.matches) / total if total else None
+
+
+def iou(first, second):
+    """Interseção sobre união dos intervalos de linhas (inclusivos) de dois code smells."""
+    intersection = min(first.end, second.end) - max(first.start, second.start) + 1
+    if intersection <= 0:
+        return 0.0
+    return intersection / (max(first.end, second.end) - min(first.start, second.start) + 1)
+
+
+def _overlapping_pairs(first, second):
+    """
+    Todos os pares (i, j) cujos intervalos `first[i]` e `second[j]` se sobrepõem.
+
+    Varre os inícios dos intervalos em ordem, mantendo em cada lado um heap
+    dos intervalos ainda abertos (ordenados pelo fim): cada intervalo que
+    começa é pareado com os abertos do outro lado. O custo é
+    O((n + m) log(n + m) + k), onde k é a quantidade de pares.
+
+    Args:
+        first (List[Tuple[int, int]]): Intervalos (início, fim) inclusivos.
+        second (List[Tuple[int, int]]): Intervalos (início, fim) inclusivos.
+    """
+    events = sorted([(start, 0, index, end) for index, (start, end) in enumerate(first)]
+                    + [(start, 1, index, end) for index, (start, end) in enumerate(second)])
+    open_intervals = ([], [])  # heaps de (fim, índice)
+    pairs = []
+    for start, side, index, end in events:
+        other = open_intervals[1 - side]
+        while other and other[0][0] < start:
+            heapq.heappop(other)
+        for _, other_index in other:
+            pairs.append((index, other_index) if side == 0 else (other_index, index))
+        heapq.heappush(open_intervals[side], (end, index))
+    return pairs
+
+
+def _match_group(reference, candidates, criteria):
+    """Pareia um a um os code smells de um mesmo grupo, preferindo os pares mais parecidos."""
+    if criteria.start_tolerance is not None:
+        tolerance = criteria.start_tolerance
+        # |a - b| <= t  <=>  [a, a + t] e [b, b + t] se sobrepõem
+        pairs = _overlapping_pairs([(finding.start, finding.start + tolerance) for finding in reference],
+                                   [(finding.start, finding.start + tolerance) for finding in candidates])
+    else:
+        pairs = _overlapping_pairs([(finding.start, finding.end) for finding in reference],
+                                   [(finding.start, finding.end) for finding in candidates])
+
+    scored = []
+    for i, j in pairs:
+        score = iou(reference[i], candidates[j])
+        if criteria.min_iou is not None and score < criteria.min_iou:
+            continue
+        scored.append((-score, abs(reference[i].start - candidates[j].start), i, j))
+    scored.sort()
+
+    used_reference = set()
+    used_candidates = set()
+    matches = []
+    for _, _, i, j in scored:
+        if i in used_reference or j in used_candidates:
+            continue
+        used_reference.add(i)
+        used_candidates.add(j)
+        matches.append((reference[i], candidates[j]))
+    missed = [finding for i, finding in enumerate(reference) if i not in used_reference]
+    extra = [finding for j, finding in enumerate(candidates) if j not in used_candidates]
+    return matches, missed, extra
+
+
+def match_findings(reference, candidates, criteria=MatchCriteria()):
+    """
+    Compara os code smells de dois relatórios (ex.: de duas ferramentas).
+
+    Os code smells são agrupados por (pacote, módulo, tipo do code smell) e,
+    em cada grupo, pareados um a um: cada code smell da referência corresponde
+    a no máximo um candidato, escolhido pela maior interseção sobre união e,
+    em caso de empate, pela menor distância entre as linhas iniciais.
+
+    Args:
+        reference (Iterable[Finding]): Code smells de referência.
+        candidates (Iterable[Finding]): Code smells comparados com a referência.
+        criteria (MatchCriteria): Critério de equivalência.
+
+    Returns:
+        MatchResult: Pares equivalentes e code smells sem par em cada lado.
+    """
+    groups = defaultdict(lambda: ([], []))
+    for finding in reference:
+        groups[finding.key][0].append(finding)
+    for finding in candidates:
+        groups[finding.key][1].append(finding)
+
+    result = MatchResult([], [], [])
+    for key in sorted(groups):
+        matches, missed, extra = _match_group(*groups[key], criteria)
+        result.matches.extend(matches)
+        result.missed.extend(missed)
+        result.extra.extend(extra)
+    return result
+
+
+def read_findings(path):
+    """Lê um relatório no formato `System,Package,Module,Smell,Line Ini,Line Fin`."""
+    findings = []
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            start = int(row["Line Ini"])
+            end = max(int(row["Line Fin"]), start) if row.get("Line Fin") else start
+            findings.append(Finding(row["System"], row["Package"], row["Module"], row["Smell"], start, end))
+    return findings
+
+
+def _percent(value):
+    return f"{value:.1%}" if value is not None else "-"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compara dois relatórios de code smells pelos intervalos de linhas.")
+    parser.add_argument("reference", help="Relatório de referência (System,Package,Module,Smell,Line Ini,Line Fin).")
+    parser.add_argument("candidate", help="Relatório comparado com a referência, no mesmo formato.")
+    criteria = parser.add_mutually_exclusive_group()
+    criteria.add_argument("--iou", type=float, metavar="THRESHOLD",
+                          help="Exige interseção sobre união dos intervalos de ao menos THRESHOLD.")
+    criteria.add_argument("--start-tolerance", type=int, metavar="LINES",
+                          help="Compara só as linhas iniciais, com diferença de até LINES linhas.")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="Grava os pares e os code smells sem par em FILE (CSV).")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = match_findings(read_findings(args.reference), read_findings(args.candidate),
+                            MatchCriteria(args.iou, args.start_tolerance))
+
+    by_smell = defaultdict(lambda: MatchResult([], [], []))
+    for field, findings in (("matches", result.matches), ("missed", result.missed), ("extra", result.extra)):
+        for item in findings:
+            smell = (item[0] if field == "matches" else item).smell
+            getattr(by_smell[smell.casefold()], field).append(item)
+    for smell, partial in sorted(by_smell.items()):
+        print(f"{smell}: {len(partial.matches)} pares, {len(partial.missed)} só na referência, "
+              f"{len(partial.extra)} só no candidato (precisão {_percent(partial.precision)}, "
+              f"revocação {_percent(partial.recall)})")
+    print(f"Total: {len(result.matches)} pares, precisão {_percent(result.precision)}, "
+          f"revocação {_percent(result.recall)}")
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Package", "Module", "Smell", "Reference Ini", "Reference Fin",
+                             "Candidate Ini", "Candidate Fin"])
+            for reference, candidate in result.matches:
+                writer.writerow([*reference[1:4], reference.start, reference.end, candidate.start, candidate.end])
+            for finding in result.missed:
+                writer.writerow([*finding[1:4], finding.start, finding.end, "", ""])
+            for finding in result.extra:
+                writer.writerow([*finding[1:4], "", "", finding.start, finding.end])
+        print(f"Pares salvos no arquivo {args.output}")
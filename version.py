@@ -0,0 +1,6 @@
+# version.py
+
+# Versão do Scylla. Deve ser incrementada sempre que um checker mudar de
+# comportamento (ou o formato dos code smells guardados mudar), pois faz
+# parte da chave do cache de resultados.
+__version__ = "1.6.3"
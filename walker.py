@@ -0,0 +1,173 @@
+# walker.py
+
+import os
+import re
+from typing import Iterator, List, NamedTuple
+
+# Diretórios que nunca contêm código do projeto analisado
+DEFAULT_EXCLUDED_DIRS = {
+    ".git", ".hg", ".svn",
+    "node_modules", "__pycache__",
+    ".venv", "venv", ".tox", ".nox", ".eggs",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache",
+}
+
+
+class IgnoreRule(NamedTuple):
+    """Padrão no formato do .gitignore, relativo ao diretório `base`."""
+    base: str
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Converte um glob do .gitignore (com suporte a `**`) em expressão regular."""
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                regex.append(f"[{body}]")
+                i = end
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return "".join(regex)
+
+
+def parse_ignore_patterns(patterns: List[str], base: str = "") -> List[IgnoreRule]:
+    """
+    Converte linhas no formato do .gitignore em regras de exclusão.
+
+    Args:
+        patterns (List[str]): Linhas do arquivo (comentários e linhas vazias são ignorados).
+        base (str): Diretório, relativo à raiz da análise, onde as regras se aplicam.
+
+    Returns:
+        List[IgnoreRule]: Regras na ordem em que aparecem.
+    """
+    rules = []
+    for pattern in patterns:
+        pattern = pattern.rstrip("\n").rstrip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        negate = pattern.startswith("!")
+        if negate:
+            pattern = pattern[1:]
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        if not pattern:
+            continue
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        regex = _glob_to_regex(pattern)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        rules.append(IgnoreRule(base, re.compile(regex + r"\Z"), negate, dir_only))
+    return rules
+
+
+def is_ignored(rel_path: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+    """
+    Indica se um caminho relativo à raiz da análise é excluído pelas regras.
+
+    Como no git, a última regra que casa com o caminho decide o resultado.
+    """
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base:
+            if not rel_path.startswith(rule.base + "/"):
+                continue
+            candidate = rel_path[len(rule.base) + 1:]
+        else:
+            candidate = rel_path
+        if rule.regex.match(candidate):
+            ignored = not rule.negate
+    return ignored
+
+
+def _read_gitignore(directory: str, base: str) -> List[IgnoreRule]:
+    try:
+        with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="ignore") as file:
+            return parse_ignore_patterns(file.readlines(), base)
+    except OSError:
+        return []
+
+
+def iter_python_files(root: str, exclude: List[str] = (), use_gitignore: bool = True) -> Iterator[str]:
+    """
+    Percorre `root` recursivamente e produz os caminhos dos arquivos `.py`.
+
+    A varredura usa `os.scandir`, aproveitando o tipo de cada entrada já
+    obtido pelo sistema operacional, e descarta diretórios excluídos antes de
+    entrar neles: controle de versão, ambientes virtuais, `node_modules`,
+    caminhos listados nos `.gitignore` e os padrões de `exclude`. Os caminhos
+    são produzidos sob demanda, em ordem alfabética dentro de cada diretório,
+    para que a análise comece antes do fim da varredura.
+
+    Args:
+        root (str): Diretório (ou arquivo .py) a analisar.
+        exclude (List[str]): Padrões adicionais no formato do .gitignore.
+        use_gitignore (bool): Respeita os arquivos .gitignore encontrados.
+
+    Yields:
+        str: Caminho de cada arquivo Python encontrado.
+    """
+    if os.path.isfile(root):
+        if root.endswith(".py"):
+            yield root
+        return
+
+    root_rules = parse_ignore_patterns(list(exclude))
+    stack = [(root, "", root_rules)]
+
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        if use_gitignore:
+            rules = rules + _read_gitignore(directory, rel_dir)
+
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        # Ambientes virtuais são reconhecidos pelo pyvenv.cfg, qualquer que seja o nome
+        if rel_dir and any(entry.name == "pyvenv.cfg" for entry in entries):
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in DEFAULT_EXCLUDED_DIRS or is_ignored(rel_path, True, rules):
+                    continue
+                subdirs.append((entry.path, rel_path, rules))
+            elif entry.name.endswith(".py") and entry.is_file():
+                if not is_ignored(rel_path, False, rules):
+                    yield entry.path
+
+        # Empilha em ordem reversa para visitar os subdiretórios em ordem alfabética
+        stack.extend(reversed(subdirs))